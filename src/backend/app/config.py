@@ -12,6 +12,11 @@ import subprocess
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+try:
+    import pynvml  # optional: pip install nvidia-ml-py
+except ImportError:
+    pynvml = None
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -86,12 +91,62 @@ STT_MODELS: Dict[str, Dict[str, Any]] = {
 # =============================================================================
 
 
+def _recommend_model_for_vram(vram_mb: int) -> str:
+    """Pick the largest STT model that fits comfortably in vram_mb."""
+    if vram_mb >= 10000:
+        return "large-v3"
+    if vram_mb >= 5000:
+        return "medium"
+    if vram_mb >= 2000:
+        return "small"
+    return "base"
+
+
+def _cuda_compute_type() -> str:
+    """int8 weights with fp16 activations, unless BACON_VOICE_FORCE_FP16 is set."""
+    return "float16" if os.environ.get("BACON_VOICE_FORCE_FP16") else "int8_float16"
+
+
+def _detect_nvidia_nvml() -> Optional[Dict[str, Any]]:
+    """
+    Query the first NVIDIA GPU through NVML (pynvml).
+
+    A direct library call, far cheaper than spawning nvidia-smi. Returns
+    None when pynvml is not installed or no GPU/driver is found.
+    """
+    if pynvml is None:
+        return None
+    try:
+        pynvml.nvmlInit()
+    except pynvml.NVMLError:
+        return None
+    try:
+        if not pynvml.nvmlDeviceGetCount():
+            return None
+        handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+        name = pynvml.nvmlDeviceGetName(handle)
+        vram_mb = pynvml.nvmlDeviceGetMemoryInfo(handle).total // (1024 * 1024)
+    except pynvml.NVMLError:
+        return None
+    finally:
+        pynvml.nvmlShutdown()
+    return {
+        "gpu_name": name.decode() if isinstance(name, bytes) else name,
+        "vram_mb": int(vram_mb),
+    }
+
+
 def detect_gpu() -> Dict[str, Any]:
     """
     Detect available GPU for STT acceleration.
 
     Checks for NVIDIA (CUDA) and AMD (ROCm) GPUs in that order,
-    falling back to CPU with int8 compute type.
+    falling back to CPU with int8 compute type. NVIDIA GPUs are queried
+    through NVML when pynvml is installed, otherwise via nvidia-smi.
+
+    CUDA defaults to int8_float16 (int8 weights, fp16 activations), which
+    halves weight memory and bandwidth against float16. Set
+    BACON_VOICE_FORCE_FP16=1 to keep full float16 weights instead.
 
     Returns:
         Dict with gpu_available, gpu_type, gpu_name, vram_mb,
@@ -106,7 +161,16 @@ def detect_gpu() -> Dict[str, Any]:
         "recommended_model": "base",
     }
 
-    # Check for NVIDIA GPU (CUDA)
+    # Check for NVIDIA GPU (CUDA), NVML first
+    nvml_info = _detect_nvidia_nvml()
+    if nvml_info:
+        result.update(nvml_info)
+        result["gpu_available"] = True
+        result["gpu_type"] = "cuda"
+        result["compute_type"] = _cuda_compute_type()
+        result["recommended_model"] = _recommend_model_for_vram(result["vram_mb"])
+        return result
+
     try:
         nvidia_output = subprocess.check_output(
             [
@@ -127,17 +191,8 @@ def detect_gpu() -> Dict[str, Any]:
             result["gpu_type"] = "cuda"
             result["gpu_name"] = gpu_name
             result["vram_mb"] = vram_mb
-            result["compute_type"] = "float16"
-
-            # Recommend model based on VRAM
-            if vram_mb >= 10000:
-                result["recommended_model"] = "large-v3"
-            elif vram_mb >= 5000:
-                result["recommended_model"] = "medium"
-            elif vram_mb >= 2000:
-                result["recommended_model"] = "small"
-            else:
-                result["recommended_model"] = "base"
+            result["compute_type"] = _cuda_compute_type()
+            result["recommended_model"] = _recommend_model_for_vram(vram_mb)
 
             return result
     except (subprocess.SubprocessError, FileNotFoundError, ValueError):
@@ -183,19 +183,14 @@ async def _transcribe_and_format(
                 status_code=400,
                 detail=f"Unknown refiner provider: {refine_provider}",
             )
-        refiner = get_refiner()
-        was_enabled = refiner._enabled
-        refiner._enabled = True
-        try:
-            refine_result = await refiner.process(
-                result.text,
-                provider_override=refine_provider,
-                prompt_override=custom_prompt,
-            )
-            refined_text = refine_result.refined_text
-            output_text = refined_text  # Save refined version
-        finally:
-            refiner._enabled = was_enabled
+        refine_result = await get_refiner().process(
+            result.text,
+            provider_override=refine_provider,
+            prompt_override=custom_prompt,
+            ignore_disabled=True,
+        )
+        refined_text = refine_result.refined_text
+        output_text = refined_text  # Save refined version
 
     # Save output file
     _cleanup_old_transcripts()
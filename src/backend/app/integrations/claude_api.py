@@ -8,7 +8,7 @@ and streaming responses.
 
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +35,12 @@ class ClaudeAPIBackend:
         model: str = DEFAULT_MODEL,
         max_tokens: int = DEFAULT_MAX_TOKENS,
         system_prompt: str = DEFAULT_SYSTEM_PROMPT,
+        env: Optional[Mapping[str, str]] = None,
     ):
-        self._api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
+        # env stands in for os.environ, so callers can supply config without touching the process
+        if env is None:
+            env = os.environ
+        self._api_key = api_key or env.get("ANTHROPIC_API_KEY")
         self._model = model
         self._max_tokens = max_tokens
         self._system_prompt = system_prompt
@@ -25,11 +25,11 @@ import tempfile
 from contextlib import asynccontextmanager
 from dataclasses import asdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from fastapi import FastAPI, File, UploadFile, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from .audio.converter import (
@@ -46,12 +46,15 @@ from .config import (
     load_settings,
 )
 from .integrations.router import get_router
+from .jsonutil import dumps as json_dumps
 from .keyboard import KeyboardEmulator
 from .discuss import router as discuss_router
 from .extract_text import router as extract_text_router
 from .file_transcribe import router as file_transcribe_router
+from .refiner import close_refiner
+from .refiner.providers.http_client import close_shared_client
 from .refiner_api import router as refiner_router
-from .stt.whisper_engine import WhisperEngine, get_engine
+from .stt.whisper_engine import WhisperEngine, get_engine, unload_engine
 
 logger = logging.getLogger(__name__)
 
@@ -109,11 +112,16 @@ async def lifespan(app: FastAPI):
     settings = load_settings()
     logger.info("Server configured on %s:%s", settings["host"], settings["port"])
 
+    # Creating the engine starts loading its model in the background, so
+    # the first transcription doesn't wait for it
+    get_engine()
+
     yield
 
     # Shutdown
-    engine = get_engine()
-    engine.unload_model()
+    unload_engine()
+    await close_refiner()
+    await close_shared_client()
     logger.info("BACON-AI Voice Backend shut down")
 
 
@@ -282,7 +290,7 @@ async def transcribe(file: UploadFile = File(...)) -> Dict[str, Any]:
         # Run transcription in thread pool
         loop = asyncio.get_event_loop()
         result = await loop.run_in_executor(
-            None, engine.transcribe_file, tmp_path, "en"
+            None, engine.transcribe_file, tmp_path
         )
 
         return {
@@ -302,6 +310,65 @@ async def transcribe(file: UploadFile = File(...)) -> Dict[str, Any]:
             pass
 
 
+def _stream_transcription(engine: WhisperEngine, tmp_path: Path) -> Iterator[bytes]:
+    """
+    Yield SSE frames for each segment of tmp_path, then a final summary.
+
+    A plain generator: StreamingResponse iterates it in the thread pool,
+    so the blocking decode never runs on the event loop.
+    """
+    start_time = time.time()
+    parts: List[str] = []
+    try:
+        for segment in engine.transcribe_file_streaming(tmp_path):
+            parts.append(segment["text"])
+            yield b"data: " + json_dumps({"segment": segment}) + b"\n\n"
+        yield b"data: " + json_dumps({
+            "done": True,
+            "text": " ".join(parts),
+            "model_used": engine.current_model,
+            "processing_time": time.time() - start_time,
+        }) + b"\n\n"
+    except Exception as e:
+        logger.error("Streaming transcription failed: %s", e)
+        yield b"data: " + json_dumps({"error": str(e)}) + b"\n\n"
+    finally:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+@app.post("/transcribe/stream")
+async def transcribe_stream(file: UploadFile = File(...)):
+    """
+    Transcribe an uploaded audio file, streaming segments as server-sent events.
+
+    Each event is a JSON object: {"segment": {...}} per decoded segment, then
+    {"done": true, "text", "model_used", "processing_time"}, or {"error"}.
+
+    Args:
+        file: Uploaded audio file (multipart form data).
+    """
+    engine = get_engine()
+
+    audio_bytes = await file.read()
+    if not audio_bytes:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "Empty audio file"},
+        )
+
+    filename = file.filename or "audio.webm"
+    fmt = get_format_from_filename(filename) or "webm"
+    tmp_path = save_temp_audio(audio_bytes, suffix=f".{fmt}")
+
+    return StreamingResponse(
+        _stream_transcription(engine, tmp_path),
+        media_type="text/event-stream",
+    )
+
+
 # =============================================================================
 # Integration Endpoints (FEAT-006 / 007 / 008)
 # =============================================================================
@@ -678,7 +745,6 @@ async def websocket_audio(websocket: WebSocket):
                                 None,
                                 engine.transcribe_file,
                                 tmp_path,
-                                "en",
                             )
                             await send_result(result)
                         finally:
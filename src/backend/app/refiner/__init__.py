@@ -20,4 +20,10 @@ def get_refiner() -> Refiner:
     return _refiner_instance
 
 
-__all__ = ["get_refiner", "RefinerResult"]
+async def close_refiner() -> None:
+    """Close the Refiner singleton's providers, if it was created."""
+    if _refiner_instance is not None:
+        await _refiner_instance.aclose()
+
+
+__all__ = ["get_refiner", "close_refiner", "RefinerResult"]
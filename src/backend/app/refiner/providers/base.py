@@ -7,7 +7,10 @@ the refine(), is_configured(), and get_info() methods.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Optional
+
+if TYPE_CHECKING:
+    import httpx
 
 
 @dataclass
@@ -22,19 +25,36 @@ class RefinerResult:
     warning: Optional[str] = None
 
 
+class FallbackModelList(list):
+    """Model list returned because the live list could not be fetched."""
+
+
 class BaseRefinerProvider(ABC):
     """Abstract base class for refiner providers."""
 
     PROVIDER_DISPLAY_NAME: str = "Unknown"
     REQUIRES_API_KEY: bool = True
 
+    # Per-instance client override (tests); None means the shared client
+    _client: Optional["httpx.AsyncClient"] = None
+
+    def _http_client(self) -> "httpx.AsyncClient":
+        """Return the HTTP client for this call, fetched fresh each time."""
+        if self._client is not None:
+            return self._client
+        # Imported here so that importing providers doesn't load httpx
+        from .http_client import get_shared_client
+
+        return get_shared_client()
+
     @abstractmethod
     async def list_models(self, custom_models: list[dict] | None = None) -> list[dict]:
         """
         Return available models for this provider.
 
         Returns:
-            List of dicts with 'id' and 'name' keys.
+            List of dicts with 'id' and 'name' keys. Providers that query a
+            remote API return a FallbackModelList when that query fails.
         """
         ...
 
@@ -58,6 +78,17 @@ class BaseRefinerProvider(ABC):
 
         Returns:
             RefinerResult with the refined text and metadata.
+
+        Prompt layout:
+            Send system_prompt unchanged as the leading system message (or
+            the API's system field) and text as the final user message.
+            Never interpolate per-request values into the system prompt;
+            a byte-identical prefix is what provider-side prompt caches hit.
+
+        Cancellation:
+            Callers may cancel the awaiting task (e.g. when the HTTP client
+            disconnects). Implementations must let asyncio.CancelledError
+            propagate and release any upstream request or subprocess.
         """
         ...
 
@@ -80,3 +111,21 @@ class BaseRefinerProvider(ABC):
     def get_info(self) -> Dict[str, Any]:
         """Return provider info (name, model, configured status)."""
         ...
+
+    async def refine_stream(
+        self,
+        text: str,
+        system_prompt: str,
+        timeout: float = 5.0,
+    ) -> AsyncIterator[str]:
+        """
+        Refine text like refine(), yielding the output as it is generated.
+
+        Providers with a streaming API override this; the default yields
+        the whole refine() result as a single chunk.
+        """
+        result = await self.refine(text, system_prompt, timeout)
+        yield result.refined_text
+
+    async def aclose(self) -> None:
+        """Release network resources held by this provider (no-op by default)."""
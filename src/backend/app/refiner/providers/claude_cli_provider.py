@@ -8,6 +8,7 @@ Based on the claude-code-wrapper skill and Odoo AI provider pattern.
 """
 
 import asyncio
+import io
 import logging
 import os
 import shutil
@@ -27,6 +28,9 @@ AVAILABLE_MODELS = [
 
 DEFAULT_MODEL = "sonnet"
 
+# Speaker labels used when flattening multi-turn history into one prompt
+_ROLE_PREFIX = {"user": "User: ", "assistant": "Assistant: "}
+
 
 def _find_claude_cli() -> Optional[str]:
     """Find the claude CLI binary."""
@@ -71,7 +75,7 @@ class ClaudeCliRefinerProvider(BaseRefinerProvider):
             }
 
         try:
-            start = time.monotonic()
+            start_ns = time.perf_counter_ns()
             proc = await asyncio.create_subprocess_exec(
                 self._cli_path, "--print", "--model", self._model,
                 "--no-session-persistence",
@@ -82,7 +86,7 @@ class ClaudeCliRefinerProvider(BaseRefinerProvider):
                 cwd="/tmp",
             )
             stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=90)
-            latency = (time.monotonic() - start) * 1000
+            latency = (time.perf_counter_ns() - start_ns) // 100_000 / 10
 
             if proc.returncode != 0:
                 err = stderr.decode().strip()[:200]
@@ -91,7 +95,7 @@ class ClaudeCliRefinerProvider(BaseRefinerProvider):
             output = stdout.decode().strip()
             return {
                 "ok": True,
-                "latency_ms": round(latency, 1),
+                "latency_ms": latency,
                 "message": f"Connected via CLI. Model: {self._model}. Response: {output[:50]}",
             }
         except asyncio.TimeoutError:
@@ -111,20 +115,25 @@ class ClaudeCliRefinerProvider(BaseRefinerProvider):
 
         # CLI startup is slow; enforce minimum 60s regardless of caller's timeout
         timeout = max(timeout, 60.0)
-        start = time.monotonic()
+        start_ns = time.perf_counter_ns()
 
         # Build the prompt
         if messages:
             # Multi-turn: combine history into a single prompt
-            parts = []
+            buf = io.StringIO()
             for msg in messages:
-                if msg["role"] == "system":
+                role = msg["role"]
+                if role == "system":
                     system_prompt = msg["content"]
-                elif msg["role"] == "user":
-                    parts.append(f"User: {msg['content']}")
-                elif msg["role"] == "assistant":
-                    parts.append(f"Assistant: {msg['content']}")
-            prompt_text = "\n\n".join(parts) if parts else text
+                    continue
+                prefix = _ROLE_PREFIX.get(role)
+                if prefix is None:
+                    continue
+                if buf.tell():
+                    buf.write("\n\n")
+                buf.write(prefix)
+                buf.write(msg["content"])
+            prompt_text = buf.getvalue() or text
         else:
             prompt_text = text
 
@@ -155,7 +164,7 @@ class ClaudeCliRefinerProvider(BaseRefinerProvider):
             err = stderr.decode().strip()[:300]
             raise ValueError(f"Claude CLI error (exit {proc.returncode}): {err}")
 
-        elapsed_ms = (time.monotonic() - start) * 1000
+        elapsed_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
         refined = stdout.decode().strip()
 
         return RefinerResult(
@@ -4,19 +4,25 @@ Gemini refiner provider for BACON-AI Voice Backend.
 Uses the Google Generative Language API for text refinement.
 """
 
+import hashlib
 import logging
 import time
-from typing import Any, Dict, Optional
-
-import httpx
+from typing import Any, Dict, Optional, Tuple
 
 from .base import BaseRefinerProvider, RefinerResult
 
 logger = logging.getLogger(__name__)
 
 GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+GEMINI_CACHE_URL = "https://generativelanguage.googleapis.com/v1beta/cachedContents"
 DEFAULT_MODEL = "gemini-2.5-flash"
 
+# System prompts longer than this are stored in a Gemini context cache so
+# repeat requests skip prefilling them. Shorter prompts fall below the
+# API's minimum cacheable token count and are always sent inline.
+CONTEXT_CACHE_MIN_CHARS = 4096
+CONTEXT_CACHE_TTL_S = 300
+
 AVAILABLE_MODELS = [
     {"id": "gemini-2.5-flash", "name": "Gemini 2.5 Flash"},
     {"id": "gemini-2.5-pro", "name": "Gemini 2.5 Pro"},
@@ -39,32 +45,71 @@ class GeminiRefinerProvider(BaseRefinerProvider):
     def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
         self._api_key = api_key
         self._model = model or DEFAULT_MODEL
-        self._client: Optional[httpx.AsyncClient] = None
+        # prompt hash -> (local expiry, cachedContents name or None on failure)
+        self._context_caches: Dict[bytes, Tuple[float, Optional[str]]] = {}
+
+    async def _get_cached_content(self, system_text: str, timeout: float) -> Optional[str]:
+        """
+        Return a cachedContents name holding *system_text*, creating it if needed.
 
-    def _get_client(self) -> httpx.AsyncClient:
-        if self._client is None:
-            self._client = httpx.AsyncClient()
-        return self._client
+        *timeout* bounds the creation request; it is taken out of the
+        caller's refine timeout.
+
+        Returns None for short prompts or if the cache could not be created,
+        in which case the caller sends the system prompt inline.
+        """
+        if len(system_text) <= CONTEXT_CACHE_MIN_CHARS:
+            return None
+
+        key = hashlib.blake2b(system_text.encode(), digest_size=16).digest()
+        now = time.monotonic()
+        entry = self._context_caches.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        name = None
+        try:
+            response = await self._http_client().post(
+                GEMINI_CACHE_URL,
+                json={
+                    "model": f"models/{self._model}",
+                    "systemInstruction": {"parts": [{"text": system_text}]},
+                    "ttl": f"{CONTEXT_CACHE_TTL_S}s",
+                },
+                params={"key": self._api_key},
+                timeout=timeout,
+            )
+            response.raise_for_status()
+            name = response.json().get("name")
+        except Exception as e:
+            logger.warning("Gemini context cache unavailable, sending prompt inline: %s", e)
+
+        # Stop reusing the entry shortly before the server-side TTL expires.
+        # Failures are remembered for the same window to avoid retrying per call.
+        self._context_caches[key] = (now + CONTEXT_CACHE_TTL_S - 30, name)
+        return name
 
     async def test_connection(self) -> dict:
         """Verify Gemini API key by listing models."""
+        import httpx
+
         if not self._api_key:
             return {"ok": False, "latency_ms": 0, "message": "API key not configured"}
         try:
-            client = self._get_client()
-            start = time.monotonic()
+            client = self._http_client()
+            start_ns = time.perf_counter_ns()
             response = await client.get(
                 GEMINI_API_URL,
                 params={"key": self._api_key},
                 timeout=5.0,
             )
-            latency = (time.monotonic() - start) * 1000
+            latency = (time.perf_counter_ns() - start_ns) // 100_000 / 10
             response.raise_for_status()
             data = response.json()
             model_count = len(data.get("models", []))
             return {
                 "ok": True,
-                "latency_ms": round(latency, 1),
+                "latency_ms": latency,
                 "message": f"Connected. {model_count} model(s) available.",
             }
         except httpx.HTTPStatusError as e:
@@ -88,14 +133,14 @@ class GeminiRefinerProvider(BaseRefinerProvider):
         if not self._api_key:
             raise ValueError("Gemini API key not configured")
 
-        client = self._get_client()
-        start = time.monotonic()
+        client = self._http_client()
+        start_ns = time.perf_counter_ns()
 
         url = f"{GEMINI_API_URL}/{self._model}:generateContent"
 
+        system_text = system_prompt
         if messages:
             # Convert OpenAI-style messages to Gemini format
-            system_text = system_prompt
             contents = []
             for msg in messages:
                 role = msg["role"]
@@ -107,30 +152,30 @@ class GeminiRefinerProvider(BaseRefinerProvider):
                         "role": gemini_role,
                         "parts": [{"text": msg["content"]}],
                     })
-            payload = {
-                "system_instruction": {
-                    "parts": [{"text": system_text}],
-                },
-                "contents": contents,
-                "generationConfig": {
-                    "temperature": 0.1,
-                    "maxOutputTokens": 2048,
-                },
-            }
         else:
-            payload = {
-                "system_instruction": {
-                    "parts": [{"text": system_prompt}],
-                },
-                "contents": [
-                    {
-                        "parts": [{"text": text}],
-                    }
-                ],
-                "generationConfig": {
-                    "temperature": 0.1,
-                    "maxOutputTokens": 2048,
-                },
+            contents = [
+                {
+                    "parts": [{"text": text}],
+                }
+            ]
+
+        payload = {
+            "contents": contents,
+            "generationConfig": {
+                "temperature": 0.1,
+                "maxOutputTokens": 2048,
+            },
+        }
+        # Creating the context cache spends at most half of the timeout budget,
+        # so generateContent always keeps at least the other half
+        cache_start = time.monotonic()
+        cached_content = await self._get_cached_content(system_text, timeout * 0.5)
+        remaining = max(timeout - (time.monotonic() - cache_start), timeout * 0.5)
+        if cached_content:
+            payload["cachedContent"] = cached_content
+        else:
+            payload["system_instruction"] = {
+                "parts": [{"text": system_text}],
             }
 
         response = await client.post(
@@ -138,12 +183,12 @@ class GeminiRefinerProvider(BaseRefinerProvider):
             json=payload,
             params={"key": self._api_key},
             headers={"Content-Type": "application/json"},
-            timeout=timeout,
+            timeout=remaining,
         )
         response.raise_for_status()
         data = response.json()
 
-        elapsed_ms = (time.monotonic() - start) * 1000
+        elapsed_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
         refined = data["candidates"][0]["content"]["parts"][0]["text"]
         tokens = data.get("usageMetadata", {}).get("totalTokenCount", 0)
 
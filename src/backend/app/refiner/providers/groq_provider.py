@@ -9,9 +9,7 @@ import logging
 import time
 from typing import Any, Dict, Optional
 
-import httpx
-
-from .base import BaseRefinerProvider, RefinerResult
+from .base import BaseRefinerProvider, FallbackModelList, RefinerResult
 
 logger = logging.getLogger(__name__)
 
@@ -36,12 +34,6 @@ class GroqRefinerProvider(BaseRefinerProvider):
     def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
         self._api_key = api_key
         self._model = model or DEFAULT_MODEL
-        self._client: Optional[httpx.AsyncClient] = None
-
-    def _get_client(self) -> httpx.AsyncClient:
-        if self._client is None:
-            self._client = httpx.AsyncClient()
-        return self._client
 
     async def list_models(self, custom_models: list[dict] | None = None) -> list[dict]:
         """Query Groq API for available models, fall back to custom or defaults."""
@@ -49,7 +41,7 @@ class GroqRefinerProvider(BaseRefinerProvider):
         if not self._api_key:
             return fallback
         try:
-            client = self._get_client()
+            client = self._http_client()
             response = await client.get(
                 GROQ_MODELS_URL,
                 headers={"Authorization": f"Bearer {self._api_key}"},
@@ -65,27 +57,29 @@ class GroqRefinerProvider(BaseRefinerProvider):
             return models if models else fallback
         except Exception:
             logger.warning("Failed to fetch Groq models, using %s", "custom" if custom_models else "defaults")
-            return fallback
+            return FallbackModelList(fallback)
 
     async def test_connection(self) -> dict:
         """Verify Groq API key by listing models."""
+        import httpx
+
         if not self._api_key:
             return {"ok": False, "latency_ms": 0, "message": "API key not configured"}
         try:
-            client = self._get_client()
-            start = time.monotonic()
+            client = self._http_client()
+            start_ns = time.perf_counter_ns()
             response = await client.get(
                 GROQ_MODELS_URL,
                 headers={"Authorization": f"Bearer {self._api_key}"},
                 timeout=5.0,
             )
-            latency = (time.monotonic() - start) * 1000
+            latency = (time.perf_counter_ns() - start_ns) // 100_000 / 10
             response.raise_for_status()
             data = response.json()
             model_count = len(data.get("data", []))
             return {
                 "ok": True,
-                "latency_ms": round(latency, 1),
+                "latency_ms": latency,
                 "message": f"Connected. {model_count} model(s) available.",
             }
         except httpx.HTTPStatusError as e:
@@ -105,8 +99,8 @@ class GroqRefinerProvider(BaseRefinerProvider):
         if not self._api_key:
             raise ValueError("Groq API key not configured")
 
-        client = self._get_client()
-        start = time.monotonic()
+        client = self._http_client()
+        start_ns = time.perf_counter_ns()
 
         if messages:
             payload_messages = messages
@@ -135,7 +129,7 @@ class GroqRefinerProvider(BaseRefinerProvider):
         response.raise_for_status()
         data = response.json()
 
-        elapsed_ms = (time.monotonic() - start) * 1000
+        elapsed_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
         refined = data["choices"][0]["message"]["content"]
         tokens = data.get("usage", {}).get("total_tokens", 0)
 
@@ -0,0 +1,74 @@
+"""
+Shared HTTP client construction for refiner providers.
+
+All HTTP-based providers share one process-wide httpx.AsyncClient from
+get_shared_client(), so they draw on a single connection pool and pooling
+and transport tuning live in one place. Per-provider details (base URL,
+auth headers) are passed on each request.
+
+The transport sets TCP_NODELAY/SO_KEEPALIVE on every connection.
+"""
+
+import importlib.util
+import logging
+import socket
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Refine payloads are small single writes; disable Nagle so they are not
+# held back waiting for a delayed ACK, and keep idle pooled sockets alive.
+_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+
+# Keep warm connections around so repeat refines skip TCP/TLS handshakes
+_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=100,
+    keepalive_expiry=30.0,
+)
+# Default for calls that don't pass their own timeout
+_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def create_async_client() -> httpx.AsyncClient:
+    """
+    Return a new pooled httpx.AsyncClient using the tuned transport.
+
+    Connections are kept alive between calls and HTTP/2 is negotiated when
+    h2 is installed, so warm requests skip the TCP and TLS handshakes.
+    """
+    # Pool limits and HTTP version are transport settings; AsyncClient
+    # ignores them when an explicit transport is passed
+    transport = httpx.AsyncHTTPTransport(
+        http2=_HTTP2_AVAILABLE,
+        limits=_LIMITS,
+        socket_options=_SOCKET_OPTIONS,
+    )
+    return httpx.AsyncClient(transport=transport, timeout=_TIMEOUT)
+
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Return the process-wide client, creating it on first use."""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = create_async_client()
+    return _shared_client
+
+
+async def close_shared_client() -> None:
+    """Close the process-wide client, if it was created."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
@@ -4,20 +4,35 @@ Ollama refiner provider for BACON-AI Voice Backend.
 Uses a local Ollama instance for text refinement. No API key required.
 """
 
+import functools
 import logging
 import os
+import platform
+import socket
 import time
-from typing import Any, Dict, Optional
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
-import httpx
-
-from .base import BaseRefinerProvider, RefinerResult
+from ...jsonutil import dumps as json_dumps, loads as json_loads
+from .base import BaseRefinerProvider, FallbackModelList, RefinerResult
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _is_wsl() -> bool:
+    """Return True when running inside WSL."""
+    return "microsoft" in platform.release().lower()
+
+
+@functools.lru_cache(maxsize=1)
 def _detect_ollama_url() -> str:
-    """Detect Ollama URL, handling WSL where localhost != Windows host."""
+    """
+    Detect Ollama URL, handling WSL where localhost != Windows host.
+
+    Cached, and only called when a provider is built without a base_url,
+    so processes that never use Ollama skip the detection entirely.
+    """
     env_url = os.environ.get("OLLAMA_HOST")
     if env_url:
         url = env_url.rstrip("/")
@@ -26,26 +41,21 @@ def _detect_ollama_url() -> str:
         return url
     # In WSL, localhost doesn't reach Windows-side Ollama.
     # Try the WSL gateway IP (Windows host) first.
-    is_wsl = "microsoft" in os.uname().release.lower()
-    if is_wsl:
+    if _is_wsl():
         try:
-            with open("/proc/net/route") as f:
-                for line in f:
-                    fields = line.strip().split()
-                    if fields[1] == "00000000":  # default route
-                        hex_ip = fields[2]
-                        ip = ".".join(
-                            str(int(hex_ip[i : i + 2], 16))
-                            for i in range(6, -1, -2)
-                        )
-                        logger.info("WSL detected, using Windows host IP %s for Ollama", ip)
-                        return f"http://{ip}:11434/api/chat"
-        except Exception:
+            routes = Path("/proc/net/route").read_text().splitlines()
+            for line in routes[1:]:  # skip header row
+                fields = line.split()
+                if len(fields) > 2 and fields[1] == "00000000":  # default route
+                    # Gateway is a little-endian hex IPv4 address
+                    ip = socket.inet_ntoa(bytes.fromhex(fields[2])[::-1])
+                    logger.info("WSL detected, using Windows host IP %s for Ollama", ip)
+                    return f"http://{ip}:11434/api/chat"
+        except (OSError, ValueError):
             pass
     return "http://localhost:11434/api/chat"
 
 
-DEFAULT_OLLAMA_URL = _detect_ollama_url()
 DEFAULT_MODEL = "llama3.2"
 
 DEFAULT_MODELS = [
@@ -65,24 +75,27 @@ class OllamaRefinerProvider(BaseRefinerProvider):
         base_url: Optional[str] = None,
     ):
         self._model = model or DEFAULT_MODEL
-        self._base_url = base_url or DEFAULT_OLLAMA_URL
-        self._client: Optional[httpx.AsyncClient] = None
-
-    def _get_client(self) -> httpx.AsyncClient:
-        if self._client is None:
-            self._client = httpx.AsyncClient()
-        return self._client
+        self._base_url = base_url or _detect_ollama_url()
+        # Model listing lives next to the chat endpoint (base_url points to /api/chat)
+        if self._base_url.endswith("/api/chat"):
+            self._tags_url = self._base_url[: -len("/api/chat")] + "/api/tags"
+        else:
+            # Appended, not joined on an absolute path, to keep any proxy prefix
+            self._tags_url = self._base_url.rstrip("/") + "/api/tags"
+        # Fixed request fields; refine() only adds the messages
+        self._payload_template = {
+            "model": self._model,
+            "stream": True,
+        }
 
     async def list_models(self, custom_models: list[dict] | None = None) -> list[dict]:
         """Query local Ollama instance for available models."""
         fallback = custom_models if custom_models is not None else list(DEFAULT_MODELS)
         try:
-            # Derive tags URL from base_url (which points to /api/chat)
-            tags_url = self._base_url.replace("/api/chat", "/api/tags")
-            client = self._get_client()
-            response = await client.get(tags_url, timeout=5.0)
+            client = self._http_client()
+            response = await client.get(self._tags_url, timeout=5.0)
             response.raise_for_status()
-            data = response.json()
+            data = json_loads(response.content)
             models = []
             for m in data.get("models", []):
                 name = m.get("name", "")
@@ -91,40 +104,41 @@ class OllamaRefinerProvider(BaseRefinerProvider):
             return models if models else fallback
         except Exception:
             logger.warning("Failed to fetch Ollama models, using %s", "custom" if custom_models else "defaults")
-            return fallback
+            return FallbackModelList(fallback)
 
     async def test_connection(self) -> dict:
         """Ping Ollama /api/tags to verify connectivity."""
-        tags_url = self._base_url.replace("/api/chat", "/api/tags")
+        import httpx
+
         try:
-            client = self._get_client()
-            start = time.monotonic()
-            response = await client.get(tags_url, timeout=5.0)
-            latency = (time.monotonic() - start) * 1000
+            client = self._http_client()
+            start_ns = time.perf_counter_ns()
+            response = await client.get(self._tags_url, timeout=5.0)
+            latency = (time.perf_counter_ns() - start_ns) // 100_000 / 10
             response.raise_for_status()
-            data = response.json()
+            data = json_loads(response.content)
             model_count = len(data.get("models", []))
             return {
                 "ok": True,
-                "latency_ms": round(latency, 1),
+                "latency_ms": latency,
                 "message": f"Connected. {model_count} model(s) available.",
             }
         except httpx.ConnectError:
-            return {"ok": False, "latency_ms": 0, "message": f"Cannot connect to {tags_url}"}
+            return {"ok": False, "latency_ms": 0, "message": f"Cannot connect to {self._tags_url}"}
         except httpx.TimeoutException:
-            return {"ok": False, "latency_ms": 0, "message": f"Connection timed out: {tags_url}"}
+            return {"ok": False, "latency_ms": 0, "message": f"Connection timed out: {self._tags_url}"}
         except Exception as e:
             return {"ok": False, "latency_ms": 0, "message": str(e)}
 
-    async def refine(
+    async def _stream_chunks(
         self,
         text: str,
         system_prompt: str,
-        timeout: float = 5.0,
+        timeout: float,
         messages: list[dict] | None = None,
-    ) -> RefinerResult:
-        client = self._get_client()
-        start = time.monotonic()
+    ) -> AsyncIterator[Tuple[str, int]]:
+        """Yield (text delta, eval_count) pairs; the count is 0 until the final chunk."""
+        client = self._http_client()
 
         if messages:
             payload_messages = messages
@@ -134,23 +148,47 @@ class OllamaRefinerProvider(BaseRefinerProvider):
                 {"role": "user", "content": text},
             ]
 
-        payload = {
-            "model": self._model,
-            "messages": payload_messages,
-            "stream": False,
-        }
+        payload = {**self._payload_template, "messages": payload_messages}
 
-        response = await client.post(
+        # Streamed as NDJSON; the final chunk has done=true and the counts
+        async with client.stream(
+            "POST",
             self._base_url,
-            json=payload,
+            content=json_dumps(payload),
+            headers={"Content-Type": "application/json"},
             timeout=timeout,
-        )
-        response.raise_for_status()
-        data = response.json()
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                chunk = json_loads(line)
+                # Errors can arrive mid-stream on a 200 response
+                if "error" in chunk:
+                    raise ValueError(f"Ollama error: {chunk['error']}")
+                content = chunk.get("message", {}).get("content", "")
+                if chunk.get("done"):
+                    yield content, chunk.get("eval_count", 0)
+                    return
+                yield content, 0
+        raise ValueError("Ollama stream ended before the final chunk")
 
-        elapsed_ms = (time.monotonic() - start) * 1000
-        refined = data["message"]["content"]
-        tokens = data.get("eval_count", 0)
+    async def refine(
+        self,
+        text: str,
+        system_prompt: str,
+        timeout: float = 5.0,
+        messages: list[dict] | None = None,
+    ) -> RefinerResult:
+        start_ns = time.perf_counter_ns()
+        parts = []
+        tokens = 0
+        async for delta, count in self._stream_chunks(text, system_prompt, timeout, messages):
+            parts.append(delta)
+            tokens = count or tokens
+
+        elapsed_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+        refined = "".join(parts)
 
         return RefinerResult(
             refined_text=refined,
@@ -160,6 +198,16 @@ class OllamaRefinerProvider(BaseRefinerProvider):
             tokens_used=tokens,
         )
 
+    async def refine_stream(
+        self,
+        text: str,
+        system_prompt: str,
+        timeout: float = 5.0,
+    ) -> AsyncIterator[str]:
+        async for delta, _ in self._stream_chunks(text, system_prompt, timeout):
+            if delta:
+                yield delta
+
     def is_configured(self) -> bool:
         # Ollama requires no API key; always configured
         return True
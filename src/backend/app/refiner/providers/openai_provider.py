@@ -4,13 +4,14 @@ OpenAI refiner provider for BACON-AI Voice Backend.
 Uses the OpenAI Chat Completions API for text refinement.
 """
 
+import hashlib
 import logging
+import re
 import time
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
-import httpx
-
-from .base import BaseRefinerProvider, RefinerResult
+from ...jsonutil import dumps as json_dumps, loads as json_loads
+from .base import BaseRefinerProvider, FallbackModelList, RefinerResult
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +28,24 @@ DEFAULT_MODELS = [
 _CHAT_MODEL_PREFIXES = ("gpt-4", "gpt-5", "gpt-3.5", "o1", "o3", "o4", "chatgpt")
 # Suffixes/substrings to exclude (non-chat variants)
 _EXCLUDE_SUBSTRINGS = ("audio", "realtime", "transcribe", "tts", "dall-e", "whisper", "embedding")
+# Both rules in one pattern: a chat prefix not followed by an excluded substring
+_MODEL_FILTER = re.compile(
+    "^(?:{})(?!.*(?:{}))".format(
+        "|".join(map(re.escape, _CHAT_MODEL_PREFIXES)),
+        "|".join(map(re.escape, _EXCLUDE_SUBSTRINGS)),
+    ),
+    re.IGNORECASE,
+)
+
+_VERSION_TOKEN = re.compile(r"\d+|\D+")
+
+
+def _version_key(model_id: str) -> tuple:
+    """Sort key comparing digit runs numerically, so gpt-10 sorts above gpt-4."""
+    return tuple(
+        (0, int(tok), "") if tok.isdigit() else (1, 0, tok)
+        for tok in _VERSION_TOKEN.findall(model_id.lower())
+    )
 
 
 class OpenAIRefinerProvider(BaseRefinerProvider):
@@ -38,12 +57,17 @@ class OpenAIRefinerProvider(BaseRefinerProvider):
     def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
         self._api_key = api_key
         self._model = model or DEFAULT_MODEL
-        self._client: Optional[httpx.AsyncClient] = None
-
-    def _get_client(self) -> httpx.AsyncClient:
-        if self._client is None:
-            self._client = httpx.AsyncClient()
-        return self._client
+        # Built once; a new key means a new provider instance (see Refiner.configure)
+        self._auth_headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._post_headers = {**self._auth_headers, "Content-Type": "application/json"}
+        # Fixed request fields; refine() only adds the messages
+        self._payload_template = {
+            "model": self._model,
+            "temperature": 0.1,
+            "max_tokens": 2048,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
 
     async def list_models(self, custom_models: list[dict] | None = None) -> list[dict]:
         """Query OpenAI API for available models, filtered to chat-capable ones."""
@@ -51,51 +75,48 @@ class OpenAIRefinerProvider(BaseRefinerProvider):
         if not self._api_key:
             return fallback
         try:
-            client = self._get_client()
+            client = self._http_client()
             response = await client.get(
                 "https://api.openai.com/v1/models",
-                headers={"Authorization": f"Bearer {self._api_key}"},
+                headers=self._auth_headers,
                 timeout=5.0,
             )
             response.raise_for_status()
-            data = response.json()
+            data = json_loads(response.content)
             models = []
             for m in data.get("data", []):
                 model_id = m.get("id", "")
-                mid_lower = model_id.lower()
-                # Include only chat-capable models
-                if not any(mid_lower.startswith(p) for p in _CHAT_MODEL_PREFIXES):
-                    continue
-                # Exclude audio/realtime/embedding variants
-                if any(exc in mid_lower for exc in _EXCLUDE_SUBSTRINGS):
-                    continue
-                models.append({"id": model_id, "name": model_id})
+                # Include only chat-capable models, minus audio/realtime/embedding variants
+                if _MODEL_FILTER.match(model_id):
+                    models.append({"id": model_id, "name": model_id})
             # Sort: newest/best first
-            models.sort(key=lambda x: x["id"], reverse=True)
+            models.sort(key=lambda x: _version_key(x["id"]), reverse=True)
             return models if models else fallback
         except Exception:
             logger.warning("Failed to fetch OpenAI models, using %s", "custom" if custom_models else "defaults")
-            return fallback
+            return FallbackModelList(fallback)
 
     async def test_connection(self) -> dict:
         """Verify OpenAI API key by listing models."""
+        import httpx
+
         if not self._api_key:
             return {"ok": False, "latency_ms": 0, "message": "API key not configured"}
         try:
-            client = self._get_client()
-            start = time.monotonic()
+            client = self._http_client()
+            start_ns = time.perf_counter_ns()
             response = await client.get(
                 "https://api.openai.com/v1/models",
-                headers={"Authorization": f"Bearer {self._api_key}"},
+                headers=self._auth_headers,
                 timeout=5.0,
             )
-            latency = (time.monotonic() - start) * 1000
+            latency = (time.perf_counter_ns() - start_ns) // 100_000 / 10
             response.raise_for_status()
-            data = response.json()
+            data = json_loads(response.content)
             model_count = len(data.get("data", []))
             return {
                 "ok": True,
-                "latency_ms": round(latency, 1),
+                "latency_ms": latency,
                 "message": f"Connected. {model_count} model(s) available.",
             }
         except httpx.HTTPStatusError as e:
@@ -105,18 +126,18 @@ class OpenAIRefinerProvider(BaseRefinerProvider):
         except Exception as e:
             return {"ok": False, "latency_ms": 0, "message": str(e)}
 
-    async def refine(
+    async def _stream_chunks(
         self,
         text: str,
         system_prompt: str,
-        timeout: float = 5.0,
+        timeout: float,
         messages: list[dict] | None = None,
-    ) -> RefinerResult:
+    ) -> AsyncIterator[Tuple[str, int]]:
+        """Yield (text delta, total_tokens) pairs; tokens are 0 until the usage chunk."""
         if not self._api_key:
             raise ValueError("OpenAI API key not configured")
 
-        client = self._get_client()
-        start = time.monotonic()
+        client = self._http_client()
 
         if messages:
             payload_messages = messages
@@ -126,28 +147,57 @@ class OpenAIRefinerProvider(BaseRefinerProvider):
                 {"role": "user", "content": text},
             ]
 
-        payload = {
-            "model": self._model,
-            "messages": payload_messages,
-            "temperature": 0.1,
-            "max_tokens": 2048,
-        }
+        payload = {**self._payload_template, "messages": payload_messages}
+        # Route requests sharing a system prompt to the same prompt cache
+        system_text = next(
+            (m["content"] for m in payload_messages if m["role"] == "system"),
+            system_prompt,
+        )
+        payload["prompt_cache_key"] = hashlib.blake2b(
+            system_text.encode(), digest_size=8
+        ).hexdigest()
 
-        response = await client.post(
+        # Streamed as server-sent events; usage arrives in the last chunk
+        async with client.stream(
+            "POST",
             OPENAI_API_URL,
-            json=payload,
-            headers={
-                "Authorization": f"Bearer {self._api_key}",
-                "Content-Type": "application/json",
-            },
+            content=json_dumps(payload),
+            headers=self._post_headers,
             timeout=timeout,
-        )
-        response.raise_for_status()
-        data = response.json()
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data = line[len("data: "):]
+                if data == "[DONE]":
+                    return
+                chunk = json_loads(data)
+                # Errors can arrive mid-stream on a 200 response
+                if "error" in chunk:
+                    raise ValueError(f"OpenAI error: {chunk['error']}")
+                for choice in chunk.get("choices", []):
+                    yield choice.get("delta", {}).get("content") or "", 0
+                if chunk.get("usage"):
+                    yield "", chunk["usage"].get("total_tokens", 0)
+        raise ValueError("OpenAI stream ended without [DONE]")
+
+    async def refine(
+        self,
+        text: str,
+        system_prompt: str,
+        timeout: float = 5.0,
+        messages: list[dict] | None = None,
+    ) -> RefinerResult:
+        start_ns = time.perf_counter_ns()
+        parts = []
+        tokens = 0
+        async for delta, count in self._stream_chunks(text, system_prompt, timeout, messages):
+            parts.append(delta)
+            tokens = count or tokens
 
-        elapsed_ms = (time.monotonic() - start) * 1000
-        refined = data["choices"][0]["message"]["content"]
-        tokens = data.get("usage", {}).get("total_tokens", 0)
+        elapsed_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+        refined = "".join(parts)
 
         return RefinerResult(
             refined_text=refined,
@@ -157,6 +207,16 @@ class OpenAIRefinerProvider(BaseRefinerProvider):
             tokens_used=tokens,
         )
 
+    async def refine_stream(
+        self,
+        text: str,
+        system_prompt: str,
+        timeout: float = 5.0,
+    ) -> AsyncIterator[str]:
+        async for delta, _ in self._stream_chunks(text, system_prompt, timeout):
+            if delta:
+                yield delta
+
     def is_configured(self) -> bool:
         return bool(self._api_key)
 
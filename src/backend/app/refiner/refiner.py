@@ -8,17 +8,25 @@ API keys are stored in ~/.config/bacon-ai-voice/.env (never in refiner.json).
 Non-secret settings (model, enabled, timeout, prompt) stay in refiner.json.
 """
 
+import asyncio
 import json
 import logging
+import os
+import re
+import sys
+import tempfile
 import time
+from collections import OrderedDict
+from dataclasses import replace
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
-from dotenv import dotenv_values, set_key
+from dotenv import dotenv_values
 
+from ..jsonutil import dumps as json_dumps, loads as json_loads
 from .prompts import get_default_prompt
 from .providers import PROVIDER_REGISTRY
-from .providers.base import BaseRefinerProvider, RefinerResult
+from .providers.base import BaseRefinerProvider, FallbackModelList, RefinerResult
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +42,118 @@ _API_KEY_ENV_VARS = {
     "gemini": "GEMINI_API_KEY",
 }
 
+# Most recent refine results kept for exact-match reuse
+_RESULT_CACHE_SIZE = 512
+
+# How long a provider's model list is reused before asking the provider again
+_MODEL_LIST_TTL_S = 60.0
+
+# A KEY=value line in .env, with the leading indent and "export " kept
+_ENV_ASSIGNMENT = re.compile(r"^(?P<prefix>\s*(?:export\s+)?)(?P<key>[A-Za-z_][A-Za-z0-9_.]*)\s*=")
+
+# Line and sentence boundaries used to split long input into separately
+# refined chunks; the group keeps the whitespace so chunks rejoin unchanged
+_SENTENCE_BREAK = re.compile(r"(\s*\n\s*|(?<=[.!?])\s+)")
+
+# Most chunks of one long input sent to the provider at the same time
+_MAX_CONCURRENT_CHUNKS = 4
+
+
+def _update_env_file(updates: Dict[str, str]) -> None:
+    """
+    Set *updates* in the .env file with a single atomic rewrite.
+
+    Only the lines assigning an updated key change; new keys are appended
+    and every other line (comments, blank lines, export prefixes, ${VAR}
+    references) is kept verbatim. The file is only rewritten when a value
+    actually changes, and the new contents go to a temp file that replaces
+    the original, so a crash never leaves a half-written .env behind.
+    """
+    if not updates:
+        return
+    lines: list = []
+    if _REFINER_ENV_FILE.exists():
+        current = dotenv_values(_REFINER_ENV_FILE, interpolate=False)
+        if all(current.get(k) == v for k, v in updates.items()):
+            return
+        lines = _REFINER_ENV_FILE.read_text().splitlines(keepends=True)
+
+    def assignment(prefix: str, key: str) -> str:
+        # Same single-quoted form dotenv.set_key writes
+        escaped = updates[key].replace("'", "\\'")
+        return f"{prefix}{key}='{escaped}'\n"
+
+    pending = dict(updates)
+    output = []
+    for line in lines:
+        match = _ENV_ASSIGNMENT.match(line)
+        if match and match.group("key") in updates:
+            output.append(assignment(match.group("prefix"), match.group("key")))
+            pending.pop(match.group("key"), None)
+        else:
+            output.append(line)
+    if pending and output and not output[-1].endswith("\n"):
+        output[-1] += "\n"
+    output.extend(assignment("", key) for key in pending)
+
+    fd, tmp_path = tempfile.mkstemp(dir=_REFINER_CONFIG_DIR, prefix=".env.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.writelines(output)
+        os.replace(tmp_path, _REFINER_ENV_FILE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+_STATUS_ERROR_KINDS = {429: "rate_limit", 401: "auth", 403: "auth"}
+# Fallback for errors that carry no HTTP response (e.g. the Claude CLI provider)
+_ERROR_MESSAGE_KINDS = re.compile(r"(?P<rate_limit>429)|(?P<auth>401|403)|(?P<timeout>timeout)", re.IGNORECASE)
+
+
+def _classify_error(error: Exception, error_msg: str) -> Optional[str]:
+    """Return 'rate_limit', 'auth', 'timeout' or None for a provider failure."""
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is not None:
+        return _STATUS_ERROR_KINDS.get(status)
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+        return "timeout"
+    # httpx is only loaded once an HTTP provider has been used
+    httpx = sys.modules.get("httpx")
+    if httpx is not None and isinstance(error, httpx.TimeoutException):
+        return "timeout"
+    match = _ERROR_MESSAGE_KINDS.search(error_msg)
+    return match.lastgroup if match else None
+
+
+def _split_for_refine(text: str, max_chars: int) -> Tuple[list, list]:
+    """
+    Split *text* at line and sentence breaks into chunks of at most *max_chars*.
+
+    Returns (chunks, separators), where separators[i] is the original
+    whitespace between chunks[i] and chunks[i + 1], so rejoining keeps
+    paragraphs and lists intact. A single sentence longer than max_chars
+    is kept whole.
+    """
+    pieces = _SENTENCE_BREAK.split(text)
+    chunks = []
+    separators = []
+    current = pieces[0]
+    for separator, piece in zip(pieces[1::2], pieces[2::2]):
+        if current and len(current) + len(separator) + len(piece) > max_chars:
+            chunks.append(current)
+            separators.append(separator)
+            current = piece
+        else:
+            current += separator + piece
+    chunks.append(current)
+    return chunks, separators
+
+
+class _LeaderCancelled(Exception):
+    """Set on a shared refine future when the task that owned it was cancelled."""
+
 
 class Refiner:
     """
@@ -51,19 +171,36 @@ class Refiner:
         self._enabled: bool = False
         self._custom_prompt: Optional[str] = None
         self._timeout: float = 15.0
+        # Inputs shorter than this are returned as-is (0 refines everything)
+        self._min_refine_chars: int = 0
+        # Longer inputs are refined as concurrent sentence-aligned chunks
+        self._max_refine_chars: int = 0
         self._provider_configs: Dict[str, Dict[str, Any]] = {}
         self._provider_models: Dict[str, list] = {}
+        # (provider, model, prompt, raw text) -> future of the in-flight refine call
+        self._inflight: Dict[Tuple[str, Any, str, str], asyncio.Future] = {}
+        self._config_lock = asyncio.Lock()
+        # (provider, model, prompt, raw text) -> last successful result, LRU order
+        self._result_cache: "OrderedDict[Tuple[str, Any, str, str], RefinerResult]" = OrderedDict()
+        # provider -> (expiry, model list) for the settings UI
+        self._model_lists: Dict[str, Tuple[float, list]] = {}
+        # Bytes last read from / written to refiner.json, to skip no-op writes
+        self._last_saved_config: Optional[bytes] = None
         self._load_persistent_config()
 
     def _load_persistent_config(self) -> None:
         """Load saved config from disk and API keys from .env on startup."""
         if _REFINER_CONFIG_FILE.exists():
             try:
-                data = json.loads(_REFINER_CONFIG_FILE.read_text())
+                raw = _REFINER_CONFIG_FILE.read_bytes()
+                data = json_loads(raw)
+                self._last_saved_config = raw
                 self._enabled = data.get("enabled", self._enabled)
                 self._active_provider = data.get("active_provider", self._active_provider)
                 self._custom_prompt = data.get("custom_prompt", self._custom_prompt)
                 self._timeout = data.get("timeout", self._timeout)
+                self._min_refine_chars = data.get("min_refine_chars", self._min_refine_chars)
+                self._max_refine_chars = data.get("max_refine_chars", self._max_refine_chars)
                 self._provider_configs = data.get("provider_configs", self._provider_configs)
                 self._provider_models = data.get("provider_models", self._provider_models)
                 logger.info("Loaded refiner config from %s", _REFINER_CONFIG_FILE)
@@ -104,66 +241,123 @@ class Refiner:
                 "active_provider": self._active_provider,
                 "custom_prompt": self._custom_prompt,
                 "timeout": self._timeout,
+                "min_refine_chars": self._min_refine_chars,
+                "max_refine_chars": self._max_refine_chars,
                 "provider_configs": clean_configs,
                 "provider_models": self._provider_models,
             }
-            _REFINER_CONFIG_FILE.write_text(json.dumps(data, indent=2))
+            encoded = json_dumps(data, indent=True)
+            if encoded == self._last_saved_config and _REFINER_CONFIG_FILE.exists():
+                return
+            _REFINER_CONFIG_FILE.write_bytes(encoded)
+            self._last_saved_config = encoded
             logger.info("Saved refiner config to %s", _REFINER_CONFIG_FILE)
         except OSError as e:
             logger.warning("Failed to save refiner config: %s", e)
 
-    def _save_keys_to_env(self) -> None:
-        """Write API keys from provider configs to the .env file."""
-        # Ensure .env file exists
-        if not _REFINER_ENV_FILE.exists():
-            _REFINER_ENV_FILE.touch()
-
+    def _api_keys_by_env_var(self) -> Dict[str, str]:
+        """Return configured API keys keyed by their .env variable name."""
+        keys = {}
         for provider_name, env_var in _API_KEY_ENV_VARS.items():
-            cfg = self._provider_configs.get(provider_name, {})
-            api_key = cfg.get("api_key")
+            api_key = self._provider_configs.get(provider_name, {}).get("api_key")
             if api_key:
-                set_key(str(_REFINER_ENV_FILE), env_var, api_key)
+                keys[env_var] = api_key
+        return keys
+
+    def _save_keys_to_env(self) -> None:
+        """Write API keys from provider configs to the .env file."""
+        _update_env_file(self._api_keys_by_env_var())
 
     def _migrate_keys_to_env(self) -> None:
         """One-time migration: move API keys from refiner.json to .env."""
-        migrated = False
-        for provider_name, env_var in _API_KEY_ENV_VARS.items():
-            cfg = self._provider_configs.get(provider_name, {})
-            api_key = cfg.get("api_key")
-            if api_key:
-                _REFINER_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-                if not _REFINER_ENV_FILE.exists():
-                    _REFINER_ENV_FILE.touch()
-                set_key(str(_REFINER_ENV_FILE), env_var, api_key)
-                migrated = True
-        if migrated:
+        keys = self._api_keys_by_env_var()
+        if keys:
+            _REFINER_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+            _update_env_file(keys)
             logger.info("Migrated API keys from refiner.json to %s", _REFINER_ENV_FILE)
 
     def _get_provider(self, name: str) -> BaseRefinerProvider:
         """
         Return the provider instance for *name*, creating it if needed.
 
+        Deliberately synchronous: with no await between the lookup and the
+        insert, concurrent requests can't both construct the same provider.
+        The single instance is then shared, so providers must support
+        concurrent refine() calls.
+
         Raises ValueError for unknown provider names.
         """
-        if name not in PROVIDER_REGISTRY:
+        # Hot path: already initialised, a single dict lookup
+        provider = self._providers.get(name)
+        if provider is not None:
+            return provider
+
+        provider_cls = PROVIDER_REGISTRY.get(name)
+        if provider_cls is None:
             raise ValueError(
                 f"Unknown refiner provider: {name}. "
                 f"Supported: {', '.join(PROVIDER_REGISTRY.keys())}"
             )
 
-        if name not in self._providers:
-            logger.info("Initialising refiner provider: %s", name)
-            cfg = self._provider_configs.get(name, {})
-            provider_cls = PROVIDER_REGISTRY[name]
-            self._providers[name] = provider_cls(**cfg)
+        logger.info("Initialising refiner provider: %s", name)
+        cfg = self._provider_configs.get(name, {})
+        provider = self._providers[name] = provider_cls(**cfg)
+        return provider
+
+    async def _refine_shared(
+        self,
+        key: Tuple[str, Any, str, str],
+        provider: BaseRefinerProvider,
+        text: str,
+        prompt: str,
+    ) -> RefinerResult:
+        """
+        Call provider.refine, sharing one upstream request among identical
+        concurrent calls.
 
-        return self._providers[name]
+        *key* is the result-cache key (provider, model, prompt, raw text), so
+        a model change while a request is in flight starts a new request.
+
+        The first caller performs the request; callers arriving while it is
+        in flight await its result (or exception) instead of sending their own.
+        """
+        while True:
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            try:
+                # Shield so one waiter being cancelled doesn't cancel the others
+                return await asyncio.shield(pending)
+            except _LeaderCancelled:
+                # The owning request was cancelled; retry, possibly as owner
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await provider.refine(text, prompt, self._timeout)
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+            # Mark the exception retrieved so asyncio doesn't warn when
+            # nobody else was waiting on it
+            if future.done() and not future.cancelled():
+                future.exception()
 
     async def process(
         self,
         raw_text: str,
         provider_override: Optional[str] = None,
         prompt_override: Optional[str] = None,
+        ignore_disabled: bool = False,
     ) -> RefinerResult:
         """
         Process raw transcribed text through the active refiner provider.
@@ -175,11 +369,14 @@ class Refiner:
         Args:
             raw_text: Raw speech-to-text output.
             provider_override: Use this provider instead of the active one.
+            prompt_override: Use this prompt instead of the configured one.
+            ignore_disabled: Refine even when the refiner is switched off
+                (explicit API calls), without touching the global toggle.
 
         Returns:
             RefinerResult with refined (or original) text.
         """
-        if not raw_text or not raw_text.strip():
+        if not raw_text or raw_text.isspace():
             return RefinerResult(
                 refined_text=raw_text,
                 provider="none",
@@ -188,7 +385,7 @@ class Refiner:
                 tokens_used=0,
             )
 
-        if not self._enabled:
+        if not (self._enabled or ignore_disabled):
             return RefinerResult(
                 refined_text=raw_text,
                 provider="disabled",
@@ -197,49 +394,226 @@ class Refiner:
                 tokens_used=0,
             )
 
+        if len(raw_text) < self._min_refine_chars:
+            return RefinerResult(
+                refined_text=raw_text,
+                provider="too-short",
+                model="none",
+                processing_time_ms=0.0,
+                tokens_used=0,
+            )
+
+        if self._max_refine_chars and len(raw_text) > self._max_refine_chars:
+            chunks, separators = _split_for_refine(raw_text, self._max_refine_chars)
+            if len(chunks) > 1:
+                return await self._process_chunks(
+                    chunks, separators, provider_override, prompt_override
+                )
+
         target = provider_override or self._active_provider
         prompt = prompt_override or self._custom_prompt or get_default_prompt()
 
         try:
             provider = self._get_provider(target)
+            # Short phrases repeat often; reuse an earlier identical refine
+            cache_key = (target, provider.get_info().get("model"), prompt, raw_text)
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+                # A copy, so callers can't alter the cached entry; no provider time spent
+                return replace(cached, processing_time_ms=0.0)
             # Wrap in XML tags so the LLM treats it as data, not as instructions.
             # This prevents prompt injection when speech contains command-like phrases
             # (e.g. "do not translate", "ignore previous instructions").
             wrapped_text = f"<transcription>\n{raw_text}\n</transcription>"
-            result = await provider.refine(wrapped_text, prompt, self._timeout)
+            # The prompt is always sent unchanged as the system message so
+            # provider-side prompt caches can reuse it; anything per-request
+            # belongs in the user message, never interpolated into the prompt.
+            result = await self._refine_shared(cache_key, provider, wrapped_text, prompt)
+            self._result_cache[cache_key] = result
+            if len(self._result_cache) > _RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
             return result
         except Exception as e:
-            error_msg = str(e)
-            logger.warning(
-                "Refiner provider '%s' failed: %s. Returning raw text.",
-                target,
-                error_msg,
-            )
-            # Build user-friendly warning message
-            if "429" in error_msg:
-                warning = f"Rate limited by {target}. Falling back to raw text. Check your API plan/credits."
-            elif "401" in error_msg or "403" in error_msg:
-                warning = f"Authentication failed for {target}. Check your API key."
-            elif "timeout" in error_msg.lower():
-                warning = f"{target} timed out after {self._timeout}s. Falling back to raw text."
-            else:
-                warning = f"{target} error: {error_msg[:150]}. Falling back to raw text."
             return RefinerResult(
                 refined_text=raw_text,
                 provider=target,
                 model="fallback",
                 processing_time_ms=0.0,
                 tokens_used=0,
-                warning=warning,
+                warning=self._fallback_warning(target, e),
             )
 
-    def configure(
+    async def _process_chunks(
+        self,
+        chunks: list,
+        separators: list,
+        provider_override: Optional[str],
+        prompt_override: Optional[str],
+    ) -> RefinerResult:
+        """Refine *chunks* a few at a time and rejoin them with *separators*."""
+        start_ns = time.perf_counter_ns()
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_CHUNKS)
+
+        async def refine_chunk(chunk: str) -> RefinerResult:
+            async with semaphore:
+                return await self.process(
+                    chunk,
+                    provider_override=provider_override,
+                    prompt_override=prompt_override,
+                    ignore_disabled=True,
+                )
+
+        results = await asyncio.gather(*(refine_chunk(chunk) for chunk in chunks))
+        parts = [results[0].refined_text]
+        for separator, result in zip(separators, results[1:]):
+            parts += (separator, result.refined_text)
+        return RefinerResult(
+            refined_text="".join(parts),
+            provider=results[0].provider,
+            model=results[0].model,
+            processing_time_ms=round((time.perf_counter_ns() - start_ns) / 1_000_000, 1),
+            tokens_used=sum(r.tokens_used for r in results),
+            warning=next((r.warning for r in results if r.warning), None),
+        )
+
+    async def process_stream(
+        self,
+        raw_text: str,
+        provider_override: Optional[str] = None,
+        prompt_override: Optional[str] = None,
+        ignore_disabled: bool = False,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Like process(), but yield the refined text as the provider generates it.
+
+        Yields {"delta": str} events followed by one final {"done": True, ...}
+        event carrying provider, model, processing_time_ms and, on failure,
+        a warning. Inputs over max_refine_chars are split like process()
+        and streamed chunk by chunk, separators included. If the provider
+        fails before producing output for a chunk, that chunk and the rest
+        are sent unrefined; a failure mid-chunk ends the stream with a
+        warning after the partial output.
+
+        Set ignore_disabled to refine even when the refiner is switched off
+        (explicit API calls).
+        """
+        start_ns = time.perf_counter_ns()
+        target = provider_override or self._active_provider
+
+        if not raw_text or raw_text.isspace():
+            skipped = "none"
+        elif not (self._enabled or ignore_disabled):
+            skipped = "disabled"
+        elif len(raw_text) < self._min_refine_chars:
+            skipped = "too-short"
+        else:
+            skipped = None
+        if skipped:
+            yield {"delta": raw_text}
+            yield {"done": True, "provider": skipped, "model": "none", "processing_time_ms": 0.0}
+            return
+
+        prompt = prompt_override or self._custom_prompt or get_default_prompt()
+        # Long inputs are split exactly as process() splits them
+        chunks, separators = [raw_text], []
+        if self._max_refine_chars and len(raw_text) > self._max_refine_chars:
+            chunks, separators = _split_for_refine(raw_text, self._max_refine_chars)
+
+        parts = []
+        model = "fallback"
+        warning = None
+        index = 0
+        chunk_started = False
+        try:
+            provider = self._get_provider(target)
+            model = provider.get_info().get("model")
+            for index, chunk in enumerate(chunks):
+                if index:
+                    parts.append(separators[index - 1])
+                    yield {"delta": separators[index - 1]}
+                chunk_started = False
+                async for delta in self._stream_chunk(target, provider, model, prompt, chunk):
+                    chunk_started = True
+                    parts.append(delta)
+                    yield {"delta": delta}
+        except Exception as e:
+            warning = self._fallback_warning(target, e)
+            if not chunk_started:
+                # Nothing of this chunk was sent; send it and the rest unrefined
+                rest = [chunks[index]]
+                for separator, chunk in zip(separators[index:], chunks[index + 1:]):
+                    rest += (separator, chunk)
+                if not parts:
+                    model = "fallback"
+                yield {"delta": "".join(rest)}
+
+        done: Dict[str, Any] = {
+            "done": True,
+            "provider": target,
+            "model": model,
+            "processing_time_ms": round((time.perf_counter_ns() - start_ns) / 1_000_000, 1),
+        }
+        if warning:
+            done["warning"] = warning
+        yield done
+
+    async def _stream_chunk(
+        self,
+        target: str,
+        provider: BaseRefinerProvider,
+        model: Optional[str],
+        prompt: str,
+        text: str,
+    ) -> AsyncIterator[str]:
+        """Stream one refine of *text*, serving and filling the result cache."""
+        cache_key = (target, model, prompt, text)
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            self._result_cache.move_to_end(cache_key)
+            yield cached.refined_text
+            return
+        start_ns = time.perf_counter_ns()
+        parts = []
+        wrapped_text = f"<transcription>\n{text}\n</transcription>"
+        async for delta in provider.refine_stream(wrapped_text, prompt, self._timeout):
+            parts.append(delta)
+            yield delta
+        self._result_cache[cache_key] = RefinerResult(
+            refined_text="".join(parts),
+            provider=target,
+            model=model,
+            processing_time_ms=round((time.perf_counter_ns() - start_ns) / 1_000_000, 1),
+        )
+        if len(self._result_cache) > _RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+
+    def _fallback_warning(self, target: str, error: Exception) -> str:
+        """Log a provider failure and return a user-friendly warning for it."""
+        error_msg = str(error)
+        logger.warning(
+            "Refiner provider '%s' failed: %s. Returning raw text.",
+            target,
+            error_msg,
+        )
+        kind = _classify_error(error, error_msg)
+        if kind == "rate_limit":
+            return f"Rate limited by {target}. Falling back to raw text. Check your API plan/credits."
+        if kind == "auth":
+            return f"Authentication failed for {target}. Check your API key."
+        if kind == "timeout":
+            return f"{target} timed out after {self._timeout}s. Falling back to raw text."
+        return f"{target} error: {error_msg[:150]}. Falling back to raw text."
+
+    async def configure(
         self,
         enabled: Optional[bool] = None,
         provider: Optional[str] = None,
         prompt: Optional[str] = None,
         timeout: Optional[float] = None,
         provider_configs: Optional[Dict[str, Dict[str, Any]]] = None,
+        min_refine_chars: Optional[int] = None,
+        max_refine_chars: Optional[int] = None,
         provider_models: Optional[Dict[str, list]] = None,
     ) -> None:
         """
@@ -250,41 +624,73 @@ class Refiner:
             provider: Set the active provider name.
             prompt: Set a custom prompt addition (None clears it).
             timeout: Set the request timeout in seconds.
+            min_refine_chars: Return shorter inputs unrefined (0 disables).
+            max_refine_chars: Split longer inputs into separately refined chunks (0 disables).
             provider_configs: Per-provider config dicts (e.g. API keys).
-        """
-        if enabled is not None:
-            self._enabled = enabled
 
-        if provider is not None:
-            if provider not in PROVIDER_REGISTRY:
+        Raises:
+            ValueError: Unknown provider, a negative min/max_refine_chars, or a
+                non-zero max_refine_chars below min_refine_chars.
+        """
+        # Held until the save finishes so the worker thread never reads
+        # state that a concurrent configure() is modifying
+        async with self._config_lock:
+            # Validated up front so a rejected update changes nothing
+            new_min = self._min_refine_chars if min_refine_chars is None else min_refine_chars
+            new_max = self._max_refine_chars if max_refine_chars is None else max_refine_chars
+            if new_min < 0 or new_max < 0:
+                raise ValueError("min_refine_chars and max_refine_chars must not be negative")
+            if new_max and new_max < new_min:
                 raise ValueError(
-                    f"Unknown provider: {provider}. "
-                    f"Supported: {', '.join(PROVIDER_REGISTRY.keys())}"
+                    f"max_refine_chars ({new_max}) must be 0 or at least "
+                    f"min_refine_chars ({new_min})"
                 )
-            self._active_provider = provider
 
-        if prompt is not None:
-            self._custom_prompt = prompt if prompt else None
+            if enabled is not None:
+                self._enabled = enabled
+
+            if provider is not None:
+                if provider not in PROVIDER_REGISTRY:
+                    raise ValueError(
+                        f"Unknown provider: {provider}. "
+                        f"Supported: {', '.join(PROVIDER_REGISTRY.keys())}"
+                    )
+                self._active_provider = provider
 
-        if timeout is not None:
-            self._timeout = timeout
+            if prompt is not None:
+                self._custom_prompt = prompt if prompt else None
 
-        if provider_configs is not None:
-            # Deep-merge per-provider configs to preserve existing keys
-            # (e.g. don't lose api_key when only model changes)
-            for name, cfg in provider_configs.items():
-                if name in self._provider_configs:
-                    self._provider_configs[name].update(cfg)
-                else:
-                    self._provider_configs[name] = cfg
-                # Recreate any already-initialised providers with new config
-                if name in self._providers:
-                    del self._providers[name]
+            if timeout is not None:
+                self._timeout = timeout
 
-        if provider_models is not None:
-            self._provider_models.update(provider_models)
+            if min_refine_chars is not None:
+                self._min_refine_chars = min_refine_chars
 
-        self._save_persistent_config()
+            if max_refine_chars is not None:
+                self._max_refine_chars = max_refine_chars
+
+            if provider_configs is not None:
+                # Deep-merge per-provider configs to preserve existing keys
+                # (e.g. don't lose api_key when only model changes)
+                for name, cfg in provider_configs.items():
+                    if name in self._provider_configs:
+                        self._provider_configs[name].update(cfg)
+                    else:
+                        self._provider_configs[name] = cfg
+                    # Recreate any already-initialised providers with new config;
+                    # HTTP providers share one client, so nothing is torn down
+                    if name in self._providers:
+                        await self._providers.pop(name).aclose()
+
+            if provider_models is not None:
+                self._provider_models.update(provider_models)
+
+            if provider_configs is not None or provider_models is not None:
+                # Keys, base URLs or custom lists changed; refetch model lists
+                self._model_lists.clear()
+
+            # Disk writes run in a worker thread so they don't block the event loop
+            await asyncio.to_thread(self._save_persistent_config)
 
     def get_config(self) -> Dict[str, Any]:
         """
@@ -308,11 +714,38 @@ class Refiner:
             "enabled": self._enabled,
             "active_provider": self._active_provider,
             "timeout": self._timeout,
+            "min_refine_chars": self._min_refine_chars,
+            "max_refine_chars": self._max_refine_chars,
             "custom_prompt": self._custom_prompt,
             "providers": providers_info,
             "provider_models": self._provider_models,
         }
 
+    async def aclose(self) -> None:
+        """Close initialised providers (the shared HTTP client is owned by the app lifespan)."""
+        for provider in self._providers.values():
+            await provider.aclose()
+
+    async def list_models(self, provider_name: str) -> list:
+        """
+        Return the model list for a provider, reusing it for a short while.
+
+        Several providers query a remote API for this, and the settings UI
+        asks again every time it opens or the provider selection changes.
+        """
+        now = time.monotonic()
+        cached = self._model_lists.get(provider_name)
+        if cached is not None and cached[0] > now:
+            models = cached[1]
+        else:
+            provider = self._get_provider(provider_name)
+            models = await provider.list_models(custom_models=self.get_custom_models(provider_name))
+            # A fallback list stands in for a failed query; ask again next time
+            if not isinstance(models, FallbackModelList):
+                self._model_lists[provider_name] = (now + _MODEL_LIST_TTL_S, models)
+        # Copies, so a caller mutating its list can't change later responses
+        return [dict(m) for m in models]
+
     def get_custom_models(self, provider_name: str) -> Optional[list]:
         """Return custom model list for a provider, or None if not configured."""
         return self._provider_models.get(provider_name)
@@ -5,16 +5,40 @@ Provides endpoints to process text, get/update configuration, and test
 the refiner with sample text.
 """
 
-from typing import Any, Dict, Optional
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Dict, Optional, TypeVar
 
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict
 
+from .jsonutil import dumps as json_dumps
 from .refiner import get_refiner
 from .refiner.providers import PROVIDER_REGISTRY
 
-router = APIRouter()
+
+class _FastJSONResponse(JSONResponse):
+    """JSONResponse encoded through jsonutil (orjson when installed)."""
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+# Endpoints pass response_model=None: they build plain dicts, so there is
+# nothing to gain from FastAPI re-validating them against the return annotation
+router = APIRouter(default_response_class=_FastJSONResponse)
+
+T = TypeVar("T")
+
+# Used by POST /refiner/test when no text is supplied
+_SAMPLE_TEXT = (
+    "um so basically i was uh thinking that we should like "
+    "you know maybe try a different approach to the problem"
+)
+
+# Deltas arriving closer together than this are sent as one SSE event
+_STREAM_FLUSH_INTERVAL_S = 0.02
 
 
 # =============================================================================
@@ -25,6 +49,8 @@ router = APIRouter()
 class RefineRequest(BaseModel):
     """Request body for the POST /refiner/process endpoint."""
 
+    model_config = ConfigDict(frozen=True)
+
     text: str
     provider: Optional[str] = None
     custom_prompt: Optional[str] = None
@@ -33,9 +59,13 @@ class RefineRequest(BaseModel):
 class RefinerConfigUpdate(BaseModel):
     """Request body for the PUT /refiner/config endpoint."""
 
+    model_config = ConfigDict(frozen=True)
+
     enabled: Optional[bool] = None
     active_provider: Optional[str] = None
     timeout: Optional[float] = None
+    min_refine_chars: Optional[int] = None
+    max_refine_chars: Optional[int] = None
     custom_prompt: Optional[str] = None
     provider_configs: Optional[Dict[str, Dict[str, Any]]] = None
     provider_models: Optional[Dict[str, list]] = None
@@ -44,17 +74,120 @@ class RefinerConfigUpdate(BaseModel):
 class RefineTestRequest(BaseModel):
     """Request body for the POST /refiner/test endpoint."""
 
+    model_config = ConfigDict(frozen=True)
+
     text: Optional[str] = None
     provider: Optional[str] = None
     custom_prompt: Optional[str] = None
 
 
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+async def _wait_for_disconnect(http_request: Request) -> None:
+    """Return once the HTTP client has disconnected."""
+    while True:
+        message = await http_request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def _run_unless_disconnected(
+    http_request: Request, work: Awaitable[T]
+) -> Optional[T]:
+    """
+    Await *work*, cancelling it if the HTTP client disconnects first.
+
+    Cancellation propagates into the provider so the upstream LLM request
+    is closed rather than left running for a client that is gone.
+
+    Returns:
+        The result of *work*, or None if the client disconnected.
+    """
+    work_task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(http_request))
+    try:
+        await asyncio.wait({work_task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+
+    if not work_task.done():
+        work_task.cancel()
+        try:
+            await work_task
+        except asyncio.CancelledError:
+            pass
+        return None
+    return work_task.result()
+
+
+def _sse(event: Dict[str, Any]) -> bytes:
+    """Frame *event* as one server-sent event."""
+    return b"data: " + json_dumps(event) + b"\n\n"
+
+
+async def _sse_events(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """
+    Frame refiner stream events as SSE, coalescing rapid deltas.
+
+    The first delta is sent immediately; later ones are buffered and sent
+    once _STREAM_FLUSH_INTERVAL_S has passed since the previous send, so
+    per-token events don't each cost a write. The flush is timed, so text
+    already received is not held back while the provider stalls.
+    """
+    iterator = events.__aiter__()
+    buffered = []
+    last_flush = 0.0
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            timeout = None
+            if buffered:
+                timeout = max(0.0, last_flush + _STREAM_FLUSH_INTERVAL_S - time.monotonic())
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                # Interval is up and the next event hasn't arrived; send what we have
+                last_flush = time.monotonic()
+                yield _sse({"delta": "".join(buffered)})
+                buffered.clear()
+                continue
+
+            task, pending = pending, None
+            try:
+                event = task.result()
+            except StopAsyncIteration:
+                break
+            if "delta" in event:
+                buffered.append(event["delta"])
+                now = time.monotonic()
+                if now - last_flush < _STREAM_FLUSH_INTERVAL_S:
+                    continue
+                last_flush = now
+                event = {"delta": "".join(buffered)}
+                buffered.clear()
+            elif buffered:
+                yield _sse({"delta": "".join(buffered)})
+                buffered.clear()
+            yield _sse(event)
+        if buffered:
+            yield _sse({"delta": "".join(buffered)})
+    finally:
+        # Client went away mid-stream: stop the refiner stream too
+        if pending is not None:
+            pending.cancel()
+            await asyncio.wait({pending})
+
+
 # =============================================================================
 # Endpoints
 # =============================================================================
 
 
-@router.get("/providers")
+@router.get("/providers", response_model=None)
 async def list_providers() -> list[dict]:
     """Return list of all providers with display name, API key requirement, and configured status."""
     refiner = get_refiner()
@@ -74,7 +207,7 @@ async def list_providers() -> list[dict]:
     return result
 
 
-@router.get("/providers/{provider_name}/models")
+@router.get("/providers/{provider_name}/models", response_model=None)
 async def list_provider_models(provider_name: str) -> list[dict]:
     """Return available models for a provider. For Groq/Ollama, queries live API."""
     if provider_name not in PROVIDER_REGISTRY:
@@ -87,9 +220,7 @@ async def list_provider_models(provider_name: str) -> list[dict]:
         )
     refiner = get_refiner()
     try:
-        provider = refiner._get_provider(provider_name)
-        custom_models = refiner.get_custom_models(provider_name)
-        return await provider.list_models(custom_models=custom_models)
+        return await refiner.list_models(provider_name)
     except Exception as e:
         return JSONResponse(
             status_code=500,
@@ -97,7 +228,7 @@ async def list_provider_models(provider_name: str) -> list[dict]:
         )
 
 
-@router.get("/providers/{provider_name}/test-connection")
+@router.get("/providers/{provider_name}/test-connection", response_model=None)
 async def test_provider_connection(provider_name: str) -> dict:
     """Test connectivity to a provider (API key validity, host reachability)."""
     if provider_name not in PROVIDER_REGISTRY:
@@ -116,13 +247,17 @@ async def test_provider_connection(provider_name: str) -> dict:
         return {"ok": False, "latency_ms": 0, "message": str(e)}
 
 
-@router.post("/process")
-async def process_text(request: RefineRequest) -> Dict[str, Any]:
+@router.post("/process", response_model=None)
+async def process_text(request: RefineRequest, http_request: Request) -> Dict[str, Any]:
     """
     Refine raw transcribed text through the active LLM provider.
 
+    The refinement is cancelled if the client disconnects before it
+    completes.
+
     Args:
         request: RefineRequest with text and optional provider override.
+        http_request: Raw request, used to detect client disconnects.
 
     Returns:
         Dict with refined_text, provider, model, processing_time_ms,
@@ -138,17 +273,20 @@ async def process_text(request: RefineRequest) -> Dict[str, Any]:
         )
 
     refiner = get_refiner()
-    # Force-enable for explicit refine calls (user intent is clear regardless of global toggle)
-    was_enabled = refiner._enabled
-    refiner._enabled = True
-    try:
-        result = await refiner.process(
+    # Refine regardless of the global toggle (user intent is clear for explicit calls)
+    result = await _run_unless_disconnected(
+        http_request,
+        refiner.process(
             request.text,
             provider_override=request.provider,
             prompt_override=request.custom_prompt or None,
-        )
-    finally:
-        refiner._enabled = was_enabled
+            ignore_disabled=True,
+        ),
+    )
+
+    if result is None:
+        # Client went away; nobody will read this response
+        return JSONResponse(status_code=499, content={"error": "Client disconnected"})
 
     response = {
         "refined_text": result.refined_text,
@@ -162,7 +300,36 @@ async def process_text(request: RefineRequest) -> Dict[str, Any]:
     return response
 
 
-@router.get("/config")
+@router.post("/process/stream", response_model=None)
+async def process_text_stream(request: RefineRequest) -> StreamingResponse:
+    """
+    Refine text like POST /process, streaming the output as server-sent events.
+
+    Each event is ``data: {"delta": "..."}``; the last one is
+    ``data: {"done": true, ...}`` with provider, model, processing_time_ms
+    and, if the provider failed, a warning. The stream (and the upstream
+    LLM request) is cancelled if the client disconnects.
+    """
+    if request.provider and request.provider not in PROVIDER_REGISTRY:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "error": f"Unknown provider: {request.provider}",
+                "available": list(PROVIDER_REGISTRY.keys()),
+            },
+        )
+
+    refiner = get_refiner()
+    events = refiner.process_stream(
+        request.text,
+        provider_override=request.provider,
+        prompt_override=request.custom_prompt or None,
+        ignore_disabled=True,
+    )
+    return StreamingResponse(_sse_events(events), media_type="text/event-stream")
+
+
+@router.get("/config", response_model=None)
 async def get_config() -> Dict[str, Any]:
     """
     Return current refiner configuration.
@@ -173,7 +340,7 @@ async def get_config() -> Dict[str, Any]:
     return refiner.get_config()
 
 
-@router.put("/config")
+@router.put("/config", response_model=None)
 async def update_config(request: RefinerConfigUpdate) -> Dict[str, Any]:
     """
     Update refiner configuration.
@@ -184,11 +351,13 @@ async def update_config(request: RefinerConfigUpdate) -> Dict[str, Any]:
     refiner = get_refiner()
 
     try:
-        refiner.configure(
+        await refiner.configure(
             enabled=request.enabled,
             provider=request.active_provider,
             prompt=request.custom_prompt,
             timeout=request.timeout,
+            min_refine_chars=request.min_refine_chars,
+            max_refine_chars=request.max_refine_chars,
             provider_configs=request.provider_configs,
             provider_models=request.provider_models,
         )
@@ -201,41 +370,31 @@ async def update_config(request: RefinerConfigUpdate) -> Dict[str, Any]:
     return refiner.get_config()
 
 
-@router.post("/test")
+@router.post("/test", response_model=None)
 async def test_refiner(request: RefineTestRequest) -> Dict[str, Any]:
     """
     Test the refiner with sample or provided text.
 
-    Uses sample text if none is provided. Temporarily enables the refiner
-    for this request if it is disabled.
+    Uses sample text if none is provided. Runs even if the refiner is
+    disabled, without changing the global toggle.
     """
-    sample = request.text or (
-        "um so basically i was uh thinking that we should like "
-        "you know maybe try a different approach to the problem"
-    )
+    sample = request.text or _SAMPLE_TEXT
 
     refiner = get_refiner()
-
-    # Temporarily enable for test
-    was_enabled = refiner._enabled
-    refiner._enabled = True
-
-    try:
-        result = await refiner.process(
-            sample,
-            provider_override=request.provider,
-            prompt_override=request.custom_prompt or None,
-        )
-        response = {
-            "original": sample,
-            "refined_text": result.refined_text,
-            "provider": result.provider,
-            "model": result.model,
-            "processing_time_ms": result.processing_time_ms,
-            "tokens_used": result.tokens_used,
-        }
-        if result.warning:
-            response["warning"] = result.warning
-        return response
-    finally:
-        refiner._enabled = was_enabled
+    result = await refiner.process(
+        sample,
+        provider_override=request.provider,
+        prompt_override=request.custom_prompt or None,
+        ignore_disabled=True,
+    )
+    response = {
+        "original": sample,
+        "refined_text": result.refined_text,
+        "provider": result.provider,
+        "model": result.model,
+        "processing_time_ms": result.processing_time_ms,
+        "tokens_used": result.tokens_used,
+    }
+    if result.warning:
+        response["warning"] = result.warning
+    return response
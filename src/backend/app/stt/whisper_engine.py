@@ -12,22 +12,130 @@ Adapted from bacon-ai-voice-mcp whisper_engine.py for the FastAPI backend.
 """
 
 import logging
+import math
+import os
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, ClassVar, Dict, Iterator, List, Optional, Union
 
-from ..config import STT_MODELS, detect_gpu, get_model_cache_dir
+try:
+    import numpy as np  # installed with faster-whisper
+except ImportError:
+    np = None
+
+from ..config import STT_MODELS, detect_gpu, get_model_cache_dir, load_settings
 
 logger = logging.getLogger(__name__)
 
+# Bytes per stored weight for each CTranslate2 compute type
+_WEIGHT_BYTES = {
+    "int8": 1,
+    "int8_float16": 1,
+    "int8_bfloat16": 1,
+    "int8_float32": 1,
+    "float16": 2,
+    "bfloat16": 2,
+    "float32": 4,
+}
+
+# Static (name, size_mb, accuracy_est) per model for get_models_info()
+_MODEL_INFO_TEMPLATES = [
+    (name, cfg["size_mb"], cfg["accuracy_est"]) for name, cfg in STT_MODELS.items()
+]
+
+# Loaded WhisperModels shared across engines and model switches, keyed by
+# (model_name, device, compute_type), least recently used first. Switching
+# back to a resident model is then a lookup instead of a multi-second load.
+# One slot by default, so a switch never keeps two models in (V)RAM; set
+# BACON_VOICE_MODEL_CACHE=2 or more to keep previous models resident.
+_MODEL_CACHE: "OrderedDict[tuple, Any]" = OrderedDict()
+
+
+def _model_cache_size() -> int:
+    """Read BACON_VOICE_MODEL_CACHE, keeping the default on a bad value."""
+    raw = os.environ.get("BACON_VOICE_MODEL_CACHE", "1")
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning("Ignoring invalid BACON_VOICE_MODEL_CACHE=%r, using 1", raw)
+        return 1
+
+
+_MODEL_CACHE_MAX = _model_cache_size()
+_model_cache_lock = threading.Lock()
+
+
+def _cache_model(key: tuple, model: Any) -> None:
+    """Add a loaded model to _MODEL_CACHE, evicting the least recently used."""
+    if _MODEL_CACHE_MAX <= 0:
+        return
+    with _model_cache_lock:
+        _MODEL_CACHE[key] = model
+        _MODEL_CACHE.move_to_end(key)
+        while len(_MODEL_CACHE) > _MODEL_CACHE_MAX:
+            evicted, _ = _MODEL_CACHE.popitem(last=False)
+            logger.info("Evicted cached Whisper model: %s", evicted[0])
+
+
+# Default for transcribe_* language: use the engine's configured language.
+# Distinct from None, which asks Faster-Whisper to detect the language.
+_ENGINE_LANGUAGE: Any = object()
+
+# Anti-aliasing FIR taps for resample_poly, keyed by (up, down). The design
+# matches resample_poly's default kaiser window; it only depends on the
+# ratio, so it is computed once per input sample rate.
+_resample_filter_cache: Dict[tuple, Any] = {}
+
+# scipy.signal, imported on first resample; importing it costs more than
+# most clips take to resample, and 16 kHz input never needs it
+_scipy_signal: Any = None
+
+
+def _file_duration(path_str: str) -> Optional[float]:
+    """
+    Read an audio file's duration from its header, without decoding it.
+
+    Returns None when soundfile is not installed or can't read the format
+    (e.g. WebM), so callers should treat None as "unknown".
+    """
+    try:
+        import soundfile
+    except ImportError:
+        return None
+    try:
+        return soundfile.info(path_str).duration
+    except Exception:
+        return None
+
+
+def _resample_to_16k(audio_data: Any, sample_rate: int) -> Any:
+    """Resample audio to 16 kHz with a polyphase FIR (no FFT, no complex buffers)."""
+    global _scipy_signal
+    if _scipy_signal is None:
+        from scipy import signal as _scipy_signal
+    signal = _scipy_signal
+
+    g = math.gcd(sample_rate, 16000)
+    up, down = 16000 // g, sample_rate // g
+    taps = _resample_filter_cache.get((up, down))
+    if taps is None:
+        max_rate = max(up, down)
+        half_len = 10 * max_rate
+        taps = signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+        _resample_filter_cache[(up, down)] = taps
+    # resample_poly copies the taps before scaling them, so the cache is safe
+    return signal.resample_poly(audio_data, up, down, window=taps).astype(np.float32, copy=False)
+
 
 # =============================================================================
 # Data Structures
 # =============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptionResult:
     """Structured result from a transcription operation."""
 
@@ -40,7 +148,7 @@ class TranscriptionResult:
     processing_time: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelInfo:
     """Information about a loaded or available model."""
 
@@ -64,18 +172,44 @@ class WhisperEngine:
     Features:
     - Automatic GPU detection (CUDA/ROCm/CPU)
     - Model auto-selection based on hardware
-    - Lazy model loading
+    - Lazy model loading, optionally pre-warmed in a background thread
     - Model switching (unload current, load new)
     - Model download with progress callbacks
     - Segment-level confidence scores
     """
 
+    __slots__ = (
+        "_model",
+        "_model_name",
+        "_device",
+        "_compute_type",
+        "_gpu_info",
+        "_download_root",
+        "_downloading",
+        "_download_progress",
+        "_default_language",
+        "_load_lock",
+        "_preload_thread",
+        "_target_model",
+        "_beam_size",
+        "_decode_options",
+        "_vad_threshold_s",
+    )
+
+    # detect_gpu() shells out to nvidia-smi/rocm-smi; probe once per process
+    _cached_gpu_info: ClassVar[Optional[Dict[str, Any]]] = None
+
     def __init__(
         self,
         model_name: Optional[str] = None,
         device: Optional[str] = None,
         compute_type: Optional[str] = None,
         download_root: Optional[Path] = None,
+        preload: bool = True,
+        default_language: Optional[str] = None,
+        beam_size: Optional[int] = None,
+        condition_on_previous_text: bool = False,
+        vad_threshold_seconds: float = 1.5,
     ):
         """
         Initialize the Whisper STT engine.
@@ -85,6 +219,16 @@ class WhisperEngine:
             device: "cuda", "cpu", or None for auto-detect.
             compute_type: "float16", "int8", etc. or None for auto.
             download_root: Directory for model downloads.
+            preload: Start loading the target model in a background thread
+                so the first transcription doesn't pay the load time.
+            default_language: Language used when transcribe_* calls don't
+                pass one; None reads "language" from the saved settings.
+            beam_size: Decoder beam width, or None for 1 on CPU (greedy,
+                single temperature) and 5 on GPU.
+            condition_on_previous_text: Feed each window's text into the
+                next as a prompt. Off by default; it can cause repetition loops.
+            vad_threshold_seconds: Skip the Silero VAD pass for clips shorter
+                than this; on short utterances it costs more than it saves.
         """
         self._model: Any = None
         self._model_name: Optional[str] = None
@@ -94,9 +238,18 @@ class WhisperEngine:
         self._download_root = download_root or get_model_cache_dir()
         self._downloading: bool = False
         self._download_progress: float = 0.0
+        # A known language skips Faster-Whisper's per-call language detection
+        self._default_language: Optional[str] = (
+            default_language or load_settings().get("language") or None
+        )
+        # Serializes model load/unload between the preload thread and requests
+        self._load_lock = threading.Lock()
+        self._preload_thread: Optional[threading.Thread] = None
 
         # Detect hardware and configure
-        self._gpu_info = detect_gpu()
+        if WhisperEngine._cached_gpu_info is None:
+            WhisperEngine._cached_gpu_info = detect_gpu()
+        self._gpu_info = WhisperEngine._cached_gpu_info
 
         # Set device
         if device:
@@ -118,13 +271,42 @@ class WhisperEngine:
         else:
             self._target_model = self._gpu_info["recommended_model"]
 
+        # Decoding options shared by every transcribe_* call. Greedy decoding
+        # (the CPU default) also pins a single temperature, so low-confidence
+        # windows aren't re-decoded at higher temperatures.
+        self._beam_size = beam_size or (1 if self._device == "cpu" else 5)
+        self._decode_options: Dict[str, Any] = {
+            "beam_size": self._beam_size,
+            "condition_on_previous_text": condition_on_previous_text,
+            "vad_parameters": dict(
+                min_silence_duration_ms=500,
+                speech_pad_ms=400,
+            ),
+        }
+        self._vad_threshold_s = vad_threshold_seconds
+        if self._beam_size == 1:
+            self._decode_options["best_of"] = 1
+            self._decode_options["temperature"] = (0.0,)
+
         logger.info(
-            "WhisperEngine configured: device=%s, compute_type=%s, target_model=%s",
+            "WhisperEngine configured: device=%s, compute_type=%s, target_model=%s, beam_size=%d",
             self._device,
             self._compute_type,
             self._target_model,
+            self._beam_size,
         )
 
+        if preload:
+            self._preload_thread = threading.Thread(
+                target=self.load_model, name="whisper-preload", daemon=True
+            )
+            self._preload_thread.start()
+
+    @classmethod
+    def invalidate_gpu_cache(cls) -> None:
+        """Forget the cached GPU probe so the next engine re-runs detect_gpu()."""
+        cls._cached_gpu_info = None
+
     # -------------------------------------------------------------------------
     # Model Management
     # -------------------------------------------------------------------------
@@ -145,6 +327,32 @@ class WhisperEngine:
         if self._model is not None and self._model_name == self._target_model:
             return True
 
+        with self._load_lock:
+            return self._load_model_locked(progress_callback)
+
+    def _load_model_locked(
+        self,
+        progress_callback: Optional[Callable[[float], None]] = None,
+    ) -> bool:
+        """Body of load_model(); the caller must hold _load_lock."""
+        # Another thread (e.g. the preload) may have finished while we waited
+        if self._model is not None and self._model_name == self._target_model:
+            return True
+
+        key = (self._target_model, self._device, self._compute_type)
+        with _model_cache_lock:
+            cached = _MODEL_CACHE.get(key)
+            if cached is not None:
+                _MODEL_CACHE.move_to_end(key)
+        if cached is not None:
+            logger.info("Using cached Whisper model: %s", self._target_model)
+            self._model = cached
+            self._model_name = self._target_model
+            self._download_progress = 1.0
+            if progress_callback:
+                progress_callback(1.0)
+            return True
+
         try:
             from faster_whisper import WhisperModel
 
@@ -168,7 +376,9 @@ class WhisperEngine:
                 device=self._device,
                 compute_type=self._compute_type,
                 download_root=str(self._download_root),
+                local_files_only=self._use_local_files_only(),
             )
+            _cache_model(key, self._model)
 
             self._model_name = self._target_model
             self._downloading = False
@@ -190,10 +400,30 @@ class WhisperEngine:
             self._downloading = False
             return False
 
+    def _use_local_files_only(self) -> bool:
+        """
+        Whether to load the target model without contacting the Hugging Face hub.
+
+        True when BACON_VOICE_OFFLINE is set, or when the model's weights are
+        already in the download cache, which skips the hub freshness check.
+        """
+        if os.environ.get("BACON_VOICE_OFFLINE"):
+            return True
+        model_dir = (
+            Path(self._download_root)
+            / f"models--Systran--faster-whisper-{self._target_model}"
+        )
+        return model_dir.is_dir() and any(model_dir.rglob("model.bin"))
+
     def switch_model(self, model_name: str) -> bool:
         """
         Switch to a different model (unload current, load new).
 
+        With BACON_VOICE_MODEL_CACHE at 2 or more the previous model stays
+        in the shared model cache, so switching back to it does not reload
+        it from disk. With the default single slot it is freed before the
+        new model loads.
+
         Args:
             model_name: Model name from STT_MODELS (tiny/base/small/medium/large-v3).
 
@@ -204,29 +434,48 @@ class WhisperEngine:
             logger.error("Unknown model: %s. Available: %s", model_name, list(STT_MODELS.keys()))
             return False
 
-        self._target_model = model_name
-        # Force reload by clearing current model
-        self._model = None
-        self._model_name = None
-
-        return self.load_model()
-
-    def unload_model(self) -> None:
-        """Unload the current model to free memory."""
-        if self._model is not None:
-            logger.info("Unloading model: %s", self._model_name)
-            del self._model
+        with self._load_lock:
+            if _MODEL_CACHE_MAX < 2 and self._model_name not in (None, model_name):
+                # No spare slot: drop the current model from the cache too,
+                # so it is freed before the new one loads
+                with _model_cache_lock:
+                    _MODEL_CACHE.pop((self._model_name, self._device, self._compute_type), None)
+            self._target_model = model_name
+            # Force reload by clearing current model
             self._model = None
             self._model_name = None
 
+            return self._load_model_locked()
+
+    def unload_model(self, evict: bool = True) -> None:
+        """
+        Unload the current model to free memory.
+
+        Args:
+            evict: Also drop it from the shared model cache. Without this
+                the weights stay resident for the next load_model().
+        """
+        with self._load_lock:
+            if self._model is not None:
+                logger.info("Unloading model: %s", self._model_name)
+                if evict:
+                    with _model_cache_lock:
+                        _MODEL_CACHE.pop(
+                            (self._model_name, self._device, self._compute_type), None
+                        )
+                del self._model
+                self._model = None
+                self._model_name = None
+
     # -------------------------------------------------------------------------
     # Transcription
     # -------------------------------------------------------------------------
 
     def transcribe_file(
         self,
-        file_path: Path,
-        language: Optional[str] = "en",
+        file_path: Union[str, Path],
+        language: Optional[str] = _ENGINE_LANGUAGE,
+        need_timestamps: bool = True,
     ) -> TranscriptionResult:
         """
         Transcribe an audio file.
@@ -236,7 +485,10 @@ class WhisperEngine:
 
         Args:
             file_path: Path to the audio file.
-            language: Language code or None for auto-detect.
+            language: Language code, None for auto-detect, or omitted for
+                the engine's default language.
+            need_timestamps: Set False to skip timestamp tokens when only
+                the text is needed (segment times are then coarse).
 
         Returns:
             TranscriptionResult with text, confidence, segments, etc.
@@ -252,15 +504,16 @@ class WhisperEngine:
                 processing_time=0.0,
             )
 
-        file_path = Path(file_path)
-        if not file_path.exists():
-            logger.error("File not found: %s", file_path)
+        # Plain string path: skips Path parsing, and is what CTranslate2 takes
+        path_str = os.fspath(file_path)
+        if not os.path.exists(path_str):
+            logger.error("File not found: %s", path_str)
             return TranscriptionResult(
                 text="",
                 confidence=0.0,
                 language="unknown",
                 duration=0.0,
-                segments=[{"error": f"File not found: {file_path}"}],
+                segments=[{"error": f"File not found: {path_str}"}],
                 model_used=self._target_model,
                 processing_time=0.0,
             )
@@ -269,14 +522,11 @@ class WhisperEngine:
 
         try:
             segments_gen, info = self._model.transcribe(
-                str(file_path),
-                language=language,
-                beam_size=5,
-                vad_filter=True,
-                vad_parameters=dict(
-                    min_silence_duration_ms=500,
-                    speech_pad_ms=400,
-                ),
+                path_str,
+                language=self._resolve_language(language),
+                without_timestamps=not need_timestamps,
+                vad_filter=self._use_vad(_file_duration(path_str)),
+                **self._decode_options,
             )
 
             return self._collect_segments(
@@ -295,11 +545,54 @@ class WhisperEngine:
                 processing_time=time.time() - start_time,
             )
 
+    def transcribe_file_streaming(
+        self,
+        file_path: Union[str, Path],
+        language: Optional[str] = _ENGINE_LANGUAGE,
+        need_timestamps: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Transcribe an audio file, yielding segment dicts as they are decoded.
+
+        Unlike transcribe_file(), the first segment is available as soon as
+        Faster-Whisper releases it instead of after the whole file.
+
+        Args:
+            file_path: Path to the audio file.
+            language: Language code, None for auto-detect, or omitted for
+                the engine's default language.
+            need_timestamps: Set False to skip timestamp tokens when only
+                the text is needed (segment times are then coarse).
+
+        Yields:
+            Segment dicts with start, end, text, avg_logprob, no_speech_prob.
+
+        Raises:
+            RuntimeError: If the model could not be loaded.
+            FileNotFoundError: If file_path does not exist.
+        """
+        if not self.load_model():
+            raise RuntimeError(f"Failed to load model: {self._target_model}")
+
+        path_str = os.fspath(file_path)
+        if not os.path.exists(path_str):
+            raise FileNotFoundError(f"File not found: {path_str}")
+
+        segments_gen, _info = self._model.transcribe(
+            path_str,
+            language=self._resolve_language(language),
+            without_timestamps=not need_timestamps,
+            vad_filter=self._use_vad(_file_duration(path_str)),
+            **self._decode_options,
+        )
+        yield from self._iter_segments(segments_gen)
+
     def transcribe_audio(
         self,
         audio_data: Any,  # numpy ndarray
         sample_rate: int = 16000,
-        language: Optional[str] = "en",
+        language: Optional[str] = _ENGINE_LANGUAGE,
+        need_timestamps: bool = True,
     ) -> TranscriptionResult:
         """
         Transcribe raw audio data (numpy array).
@@ -307,12 +600,16 @@ class WhisperEngine:
         Args:
             audio_data: Numpy array of audio samples (float32, mono).
             sample_rate: Sample rate in Hz.
-            language: Language code or None for auto-detect.
+            language: Language code, None for auto-detect, or omitted for
+                the engine's default language.
+            need_timestamps: Set False to skip timestamp tokens when only
+                the text is needed (segment times are then coarse).
 
         Returns:
             TranscriptionResult.
         """
-        import numpy as np
+        if np is None:
+            raise RuntimeError("numpy is required for transcribe_audio")
 
         if not self.load_model():
             return TranscriptionResult(
@@ -327,21 +624,24 @@ class WhisperEngine:
 
         start_time = time.time()
 
-        # Ensure float32 and normalized
-        if audio_data.dtype != np.float32:
-            audio_data = audio_data.astype(np.float32)
+        # Ensure contiguous float32 (copying only if needed) and normalized
+        owned = audio_data.dtype != np.float32 or not audio_data.flags.c_contiguous
+        if owned:
+            audio_data = np.ascontiguousarray(audio_data, dtype=np.float32)
 
-        max_val = np.abs(audio_data).max()
+        # Peak via max/min reads instead of materializing np.abs(audio_data)
+        max_val = max(audio_data.max(), -audio_data.min())
         if max_val > 1.0:
-            audio_data = audio_data / max_val
+            if owned:
+                # Our own copy; scale in place rather than allocating another
+                np.multiply(audio_data, 1.0 / max_val, out=audio_data)
+            else:
+                audio_data = audio_data * np.float32(1.0 / max_val)
 
         # Resample to 16kHz if needed
         if sample_rate != 16000:
             try:
-                from scipy import signal
-
-                num_samples = int(len(audio_data) * 16000 / sample_rate)
-                audio_data = signal.resample(audio_data, num_samples)
+                audio_data = _resample_to_16k(audio_data, sample_rate)
             except ImportError:
                 logger.warning("scipy not available for resampling; proceeding with original sample rate")
 
@@ -350,13 +650,10 @@ class WhisperEngine:
         try:
             segments_gen, info = self._model.transcribe(
                 audio_data,
-                language=language,
-                beam_size=5,
-                vad_filter=True,
-                vad_parameters=dict(
-                    min_silence_duration_ms=500,
-                    speech_pad_ms=400,
-                ),
+                language=self._resolve_language(language),
+                without_timestamps=not need_timestamps,
+                vad_filter=self._use_vad(duration),
+                **self._decode_options,
             )
 
             return self._collect_segments(
@@ -388,6 +685,8 @@ class WhisperEngine:
             "target_model": self._target_model,
             "device": self._device,
             "compute_type": self._compute_type,
+            "beam_size": self._beam_size,
+            "effective_weight_bytes": _WEIGHT_BYTES.get(self._compute_type),
             "gpu_available": self._gpu_info.get("gpu_available", False),
             "gpu_type": self._gpu_info.get("gpu_type"),
             "gpu_name": self._gpu_info.get("gpu_name"),
@@ -396,27 +695,24 @@ class WhisperEngine:
             "available_models": list(STT_MODELS.keys()),
             "downloading": self._downloading,
             "download_progress": self._download_progress,
+            "loading": self.is_loading(),
         }
 
     def get_models_info(self) -> List[ModelInfo]:
         """Get information about all available models."""
-        models = []
-        for name, cfg in STT_MODELS.items():
-            models.append(
-                ModelInfo(
-                    name=name,
-                    size_mb=cfg["size_mb"],
-                    accuracy_est=cfg["accuracy_est"],
-                    loaded=(self._model_name == name and self._model is not None),
-                    downloading=(self._downloading and self._target_model == name),
-                    download_progress=(
-                        self._download_progress
-                        if self._target_model == name
-                        else 0.0
-                    ),
-                )
+        loaded_name = self._model_name if self._model is not None else None
+        target = self._target_model
+        return [
+            ModelInfo(
+                name=name,
+                size_mb=size_mb,
+                accuracy_est=accuracy_est,
+                loaded=name == loaded_name,
+                downloading=self._downloading and name == target,
+                download_progress=self._download_progress if name == target else 0.0,
             )
-        return models
+            for name, size_mb, accuracy_est in _MODEL_INFO_TEMPLATES
+        ]
 
     def get_gpu_info(self) -> Dict[str, Any]:
         """Get GPU detection results."""
@@ -426,6 +722,11 @@ class WhisperEngine:
         """Check if engine has a model loaded and is ready to transcribe."""
         return self._model is not None
 
+    def is_loading(self) -> bool:
+        """Check if a model load (background preload or on request) is in progress."""
+        preloading = self._preload_thread is not None and self._preload_thread.is_alive()
+        return preloading or self._downloading
+
     @property
     def current_model(self) -> Optional[str]:
         """Name of the currently loaded model, or None."""
@@ -440,37 +741,45 @@ class WhisperEngine:
     # Internal Helpers
     # -------------------------------------------------------------------------
 
-    @staticmethod
-    def _collect_segments(
-        segments_gen: Any,
-        info: Any,
-        start_time: float,
-        model_name: Optional[str],
-    ) -> TranscriptionResult:
-        """Collect segments from Faster-Whisper generator into a TranscriptionResult."""
-        segments: List[Dict[str, Any]] = []
-        full_text_parts: List[str] = []
-        total_confidence = 0.0
-        segment_count = 0
+    def _use_vad(self, duration: Optional[float]) -> bool:
+        """VAD pays off unless the clip is known to be shorter than the threshold."""
+        return duration is None or duration >= self._vad_threshold_s
+
+    def _resolve_language(self, language: Optional[str]) -> Optional[str]:
+        """Map the transcribe_* language argument to what Faster-Whisper takes."""
+        return self._default_language if language is _ENGINE_LANGUAGE else language
 
+    @staticmethod
+    def _iter_segments(segments_gen: Any) -> Iterator[Dict[str, Any]]:
+        """Convert Faster-Whisper segments to dicts as the generator produces them."""
         for segment in segments_gen:
-            seg_dict = {
+            yield {
                 "start": segment.start,
                 "end": segment.end,
                 "text": segment.text.strip(),
                 "avg_logprob": segment.avg_logprob,
                 "no_speech_prob": segment.no_speech_prob,
             }
-            segments.append(seg_dict)
-            full_text_parts.append(segment.text.strip())
 
-            # Confidence from log probability: avg_logprob is typically -0.5 to 0
-            segment_conf = min(1.0, max(0.0, 1.0 + segment.avg_logprob))
-            total_confidence += segment_conf
-            segment_count += 1
+    @staticmethod
+    def _collect_segments(
+        segments_gen: Any,
+        info: Any,
+        start_time: float,
+        model_name: Optional[str],
+    ) -> TranscriptionResult:
+        """Collect segments from Faster-Whisper generator into a TranscriptionResult."""
+        # list() grows the list in C; faster than a Python-level append loop
+        segments: List[Dict[str, Any]] = list(WhisperEngine._iter_segments(segments_gen))
+        # Confidence from log probability: avg_logprob is typically -0.5 to 0
+        total_confidence = sum(
+            min(1.0, max(0.0, 1.0 + seg["avg_logprob"])) for seg in segments
+        )
 
-        full_text = " ".join(full_text_parts)
-        avg_confidence = total_confidence / segment_count if segment_count > 0 else 0.0
+        # Segment texts are stripped once in _iter_segments and reused here
+        full_text = " ".join(seg["text"] for seg in segments)
+        # With no segments the sum is 0.0, so dividing by 1 yields 0.0
+        avg_confidence = total_confidence / (len(segments) or 1)
         processing_time = time.time() - start_time
 
         return TranscriptionResult(
@@ -489,11 +798,13 @@ class WhisperEngine:
 # =============================================================================
 
 _engine_instance: Optional[WhisperEngine] = None
+_engine_lock = threading.Lock()
 
 
 def get_engine(
     model_name: Optional[str] = None,
     force_new: bool = False,
+    preload: bool = True,
 ) -> WhisperEngine:
     """
     Get or create the WhisperEngine singleton.
@@ -501,13 +812,27 @@ def get_engine(
     Args:
         model_name: Model name or None for auto-detect.
         force_new: Force creation of a new engine instance.
+        preload: Start loading the model in the background when a new
+            engine is created.
 
     Returns:
         WhisperEngine instance.
     """
     global _engine_instance
 
-    if _engine_instance is None or force_new:
-        _engine_instance = WhisperEngine(model_name=model_name)
-
-    return _engine_instance
+    # Double-checked: the common path is lock-free, and concurrent first
+    # calls (request handlers run in several threads) build only one engine
+    inst = _engine_instance
+    if inst is None or force_new:
+        with _engine_lock:
+            inst = _engine_instance
+            if inst is None or force_new:
+                inst = WhisperEngine(model_name=model_name, preload=preload)
+                _engine_instance = inst
+    return inst
+
+
+def unload_engine() -> None:
+    """Unload the WhisperEngine singleton's model, if it was created."""
+    if _engine_instance is not None:
+        _engine_instance.unload_model()
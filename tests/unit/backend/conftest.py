@@ -7,16 +7,17 @@ Provides a FastAPI test client, mock Whisper engine, and test audio data.
 import io
 import struct
 import sys
-from pathlib import Path
 from typing import Any, Dict, List, Optional
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-# Add backend source to path
-backend_src = Path(__file__).resolve().parents[3] / "src" / "backend"
-if str(backend_src) not in sys.path:
-    sys.path.insert(0, str(backend_src))
+from app.refiner.providers.base import RefinerResult
+
+try:
+    import uvloop  # optional: faster event loop for the async tests
+except ImportError:
+    uvloop = None
 
 
 # ============================================================================
@@ -73,6 +74,59 @@ class MockWhisperModel:
         return iter(segments), info
 
 
+# ============================================================================
+# Mock Refiner Provider
+# ============================================================================
+
+
+class MockRefinerProvider:
+    """Stand-in for the active "ollama" provider; tests reassign methods as needed."""
+
+    def is_configured(self) -> bool:
+        return True
+
+    def get_info(self) -> Dict[str, Any]:
+        return {"name": "ollama", "model": "llama3.2", "configured": True}
+
+    async def refine(self, text, system_prompt, timeout=5.0, messages=None) -> RefinerResult:
+        # A new result each call; the refiner caches and may hand it back as is
+        return RefinerResult(
+            refined_text="Refined output.",
+            provider="ollama",
+            model="llama3.2",
+            processing_time_ms=50.0,
+            tokens_used=20,
+        )
+
+    async def list_models(self, custom_models=None) -> List[Dict[str, str]]:
+        return [
+            {"id": "llama3.2", "name": "llama3.2"},
+            {"id": "llama3.1", "name": "llama3.1"},
+        ]
+
+    async def aclose(self) -> None:
+        pass
+
+
+# ============================================================================
+# Event Loop
+# ============================================================================
+
+
+if uvloop is not None:
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop when it is installed."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Pin anyio-marked tests to asyncio instead of every installed backend (e.g. trio)."""
+    return "asyncio"
+
+
 # ============================================================================
 # Fixtures
 # ============================================================================
@@ -98,6 +152,10 @@ def mock_gpu_detection(monkeypatch):
         "app.stt.whisper_engine.detect_gpu",
         lambda: mock_gpu_info,
     )
+    # Drop any probe result cached by an earlier engine
+    from app.stt.whisper_engine import WhisperEngine
+
+    WhisperEngine.invalidate_gpu_cache()
 
 
 @pytest.fixture()
@@ -111,43 +169,136 @@ def mock_whisper_model(monkeypatch):
     mock_module = MagicMock()
     mock_module.WhisperModel = MockWhisperModel
     monkeypatch.setitem(sys.modules, "faster_whisper", mock_module)
+    # Models cached by earlier tests would bypass this mock
+    import app.stt.whisper_engine as engine_mod
+
+    engine_mod._MODEL_CACHE.clear()
     return MockWhisperModel
 
 
 @pytest.fixture()
 def engine_with_mock(mock_whisper_model, monkeypatch):
     """Create a WhisperEngine with mocked model loading."""
-    # Reset the singleton
     import app.stt.whisper_engine as engine_mod
 
-    engine_mod._engine_instance = None
-
-    engine = engine_mod.get_engine(model_name="base", force_new=True)
+    # No preload thread, so nothing loads after the test's patches are undone
+    engine = engine_mod.get_engine(model_name="base", force_new=True, preload=False)
     return engine
 
 
-@pytest.fixture()
-def test_client(mock_whisper_model, monkeypatch):
-    """Create a FastAPI TestClient with mocked dependencies."""
-    # Reset engine singleton before creating test client
-    import app.stt.whisper_engine as engine_mod
-
-    engine_mod._engine_instance = None
+@pytest.fixture(scope="session")
+async def _asgi_client():
+    """
+    One httpx client bound to the FastAPI app for the whole session.
 
+    ASGITransport holds no connections, so sharing it is safe; per-test
+    state is reset by test_client. The lifespan is not run, so startup
+    never probes the real GPU.
+    """
     from httpx import ASGITransport, AsyncClient
 
     from app.main import app
 
     transport = ASGITransport(app=app)
-    return AsyncClient(transport=transport, base_url="http://testserver")
+    client = AsyncClient(transport=transport, base_url="http://testserver")
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture()
+def test_client(_asgi_client, mock_whisper_model):
+    """Provide the shared app client with a fresh, mock-backed engine."""
+    # A fresh engine on the mock model; no preload thread to outlive the test
+    import app.stt.whisper_engine as engine_mod
+
+    engine_mod.get_engine(force_new=True, preload=False)
+    return _asgi_client
+
+
+def _no_mock_handler(request):
+    raise AssertionError(f"No mock handler set for {request.method} {request.url}")
+
+
+@pytest.fixture(scope="session")
+def _mock_transport():
+    """One MockTransport for the session; mock_client_factory swaps its handler."""
+    import httpx
+
+    return httpx.MockTransport(_no_mock_handler)
+
+
+@pytest.fixture(scope="session")
+async def _mock_http_client(_mock_transport):
+    """The httpx client over _mock_transport, shared by every provider test."""
+    import httpx
+
+    client = httpx.AsyncClient(transport=_mock_transport)
+    yield client
+    await client.aclose()
 
 
 @pytest.fixture()
+def mock_client_factory(_mock_transport, _mock_http_client):
+    """
+    Point the shared mock httpx client at a MockTransport handler.
+
+    Usage: provider._client = mock_client_factory(handler)
+
+    Every call returns the same client, so the handler passed last answers
+    all requests. The handler is cleared after the test.
+    """
+
+    def make(handler):
+        _mock_transport.handler = handler
+        return _mock_http_client
+
+    yield make
+    _mock_transport.handler = _no_mock_handler
+
+
+@pytest.fixture(autouse=True)
+def isolated_refiner_config(tmp_path, monkeypatch):
+    """Point refiner.json and .env at tmp_path so no test sees the user's config."""
+    config_dir = tmp_path / "bacon-ai-voice"
+    monkeypatch.setattr("app.refiner.refiner._REFINER_CONFIG_DIR", config_dir)
+    monkeypatch.setattr("app.refiner.refiner._REFINER_CONFIG_FILE", config_dir / "refiner.json")
+    monkeypatch.setattr("app.refiner.refiner._REFINER_ENV_FILE", config_dir / ".env")
+    return config_dir
+
+
+@pytest.fixture()
+def mock_refiner(monkeypatch):
+    """
+    A fresh Refiner installed as the app's refiner singleton.
+
+    Enabled, with a mock "ollama" provider as the active provider. Tests
+    override what they need, e.g. mock_refiner._providers["ollama"].refine.
+    """
+    from app.refiner.refiner import Refiner
+
+    refiner = Refiner()
+    refiner._enabled = True
+    refiner._active_provider = "ollama"
+    refiner._providers["ollama"] = MockRefinerProvider()
+
+    monkeypatch.setattr("app.refiner_api.get_refiner", lambda: refiner)
+    monkeypatch.setattr("app.refiner.get_refiner", lambda: refiner)
+    return refiner
+
+
+@pytest.fixture()
+def refiner_client(test_client, mock_refiner):
+    """Provide the shared app client with mock_refiner as the refiner singleton."""
+    return test_client
+
+
+@pytest.fixture(scope="session")
 def test_wav_bytes() -> bytes:
     """
     Create a minimal valid WAV file (16kHz mono, 0.5s silence).
 
     This is generated programmatically -- no external audio files needed.
+    Built once per session; bytes are immutable, so tests can share them.
     """
     sample_rate = 16000
     duration_seconds = 0.5
@@ -3,17 +3,12 @@ Tests for app.config module - settings, GPU detection, model configs.
 """
 
 import json
-import sys
 from pathlib import Path
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
 import pytest
 
-# Ensure backend source is on path
-backend_src = Path(__file__).resolve().parents[3] / "src" / "backend"
-if str(backend_src) not in sys.path:
-    sys.path.insert(0, str(backend_src))
-
 from app.config import (
     STT_MODELS,
     SERVER_HOST,
@@ -57,6 +52,11 @@ class TestSTTModels:
 class TestGPUDetection:
     """Tests for GPU detection (mocked to avoid hardware dependency)."""
 
+    @pytest.fixture(autouse=True)
+    def no_nvml(self, monkeypatch):
+        """Force the nvidia-smi path unless a test installs a fake pynvml."""
+        monkeypatch.setattr("app.config.pynvml", None)
+
     def test_detect_gpu_returns_dict(self):
         """detect_gpu should return a dict with expected keys."""
         # Use real detect_gpu but it will find no GPU in CI
@@ -85,9 +85,18 @@ class TestGPUDetection:
             assert result["gpu_type"] == "cuda"
             assert result["gpu_name"] == "NVIDIA GeForce RTX 3080"
             assert result["vram_mb"] == 10240
-            assert result["compute_type"] == "float16"
+            assert result["compute_type"] == "int8_float16"
             assert result["recommended_model"] == "large-v3"
 
+    def test_force_fp16_env(self, monkeypatch):
+        """BACON_VOICE_FORCE_FP16 should keep float16 weights on CUDA."""
+        monkeypatch.setenv("BACON_VOICE_FORCE_FP16", "1")
+        nvidia_output = "NVIDIA GeForce RTX 3080, 10240"
+
+        with patch("app.config.subprocess.check_output", return_value=nvidia_output):
+            result = detect_gpu()
+            assert result["compute_type"] == "float16"
+
     def test_small_gpu_recommends_base(self):
         """A GPU with <2GB VRAM should recommend base model."""
         nvidia_output = "NVIDIA GeForce GT 1030, 1500"
@@ -96,6 +105,29 @@ class TestGPUDetection:
             result = detect_gpu()
             assert result["recommended_model"] == "base"
 
+    def test_nvml_preferred_over_nvidia_smi(self, monkeypatch):
+        """With pynvml available, detection should not spawn nvidia-smi."""
+        fake_nvml = SimpleNamespace(
+            NVMLError=RuntimeError,
+            nvmlInit=MagicMock(),
+            nvmlShutdown=MagicMock(),
+            nvmlDeviceGetCount=lambda: 1,
+            nvmlDeviceGetHandleByIndex=lambda i: "handle",
+            nvmlDeviceGetName=lambda h: b"NVIDIA GeForce RTX 4070",
+            nvmlDeviceGetMemoryInfo=lambda h: SimpleNamespace(total=12282 * 1024 * 1024),
+        )
+        monkeypatch.setattr("app.config.pynvml", fake_nvml)
+
+        with patch("app.config.subprocess.check_output") as check_output:
+            result = detect_gpu()
+
+        check_output.assert_not_called()
+        fake_nvml.nvmlShutdown.assert_called_once()
+        assert result["gpu_type"] == "cuda"
+        assert result["gpu_name"] == "NVIDIA GeForce RTX 4070"
+        assert result["vram_mb"] == 12282
+        assert result["recommended_model"] == "large-v3"
+
 
 class TestGetDefaultModel:
     """Tests for get_default_model."""
@@ -13,19 +13,14 @@ Test IDs:
 """
 
 import asyncio
-import sys
+from dataclasses import dataclass
 from pathlib import Path
 from types import SimpleNamespace
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-# Ensure backend source is importable
-backend_src = Path(__file__).resolve().parents[3] / "src" / "backend"
-if str(backend_src) not in sys.path:
-    sys.path.insert(0, str(backend_src))
-
 from app.integrations.claude_api import ClaudeAPIBackend
 from app.integrations.mcp_server import MCPServerBackend
 from app.integrations.router import IntegrationRouter
@@ -37,91 +32,111 @@ from app.integrations.ws_bridge import WebSocketBridgeBackend
 # ============================================================================
 
 
+@pytest.fixture(scope="module")
+def _shared_router():
+    """One IntegrationRouter for the module; see the router fixture."""
+    return IntegrationRouter()
+
+
+@pytest.fixture()
+def router(_shared_router):
+    """The shared router, reset to a freshly constructed router's state."""
+    _shared_router._backends.clear()
+    _shared_router._active_backend = "claude-api"
+    return _shared_router
+
+
+@dataclass(frozen=True, slots=True)
+class _FakeContent:
+    text: str
+    type: str = "text"
+
+
+@dataclass(frozen=True, slots=True)
+class _FakeUsage:
+    input_tokens: int
+    output_tokens: int
+
+
+@dataclass(frozen=True, slots=True)
+class _FakeAnthropicResponse:
+    """The parts of an Anthropic messages.create() response ClaudeAPIBackend reads."""
+
+    content: Tuple[_FakeContent, ...]
+    model: str
+    usage: _FakeUsage
+
+
 def _make_mock_anthropic_response(
     text: str = "Hello from Claude",
     model: str = "claude-sonnet-4-5-20250929",
     input_tokens: int = 10,
     output_tokens: int = 25,
-):
-    """Build a mock Anthropic messages.create() response object."""
-    content_block = SimpleNamespace(text=text)
-    usage = SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens)
-    return SimpleNamespace(
-        content=[content_block],
+) -> _FakeAnthropicResponse:
+    """Build a fake Anthropic messages.create() response object."""
+    return _FakeAnthropicResponse(
+        content=(_FakeContent(text),),
         model=model,
-        usage=usage,
+        usage=_FakeUsage(input_tokens, output_tokens),
     )
 
 
-# ============================================================================
-# TUT-B009: IntegrationRouter routes to correct backend
-# ============================================================================
-
-
-@pytest.mark.asyncio
-async def test_router_routes_to_claude_api():
-    """TUT-B009a: Router dispatches to claude-api backend."""
-    router = IntegrationRouter()
+def _fake_proc(stdout: bytes, stderr: bytes, returncode: int) -> SimpleNamespace:
+    """Minimal stand-in for an asyncio subprocess: communicate() and returncode."""
 
-    # Inject a mock backend
-    mock_backend = MagicMock()
-    mock_backend.send = AsyncMock(
-        return_value={"success": True, "message": "ok", "response": "mocked"}
-    )
-    router._backends["claude-api"] = mock_backend
+    async def communicate(input=None):
+        return stdout, stderr
 
-    result = await router.send("Hello", backend="claude-api")
+    return SimpleNamespace(communicate=communicate, returncode=returncode)
 
-    mock_backend.send.assert_awaited_once_with("Hello", {})
-    assert result["success"] is True
-    assert result["backend"] == "claude-api"
 
+# Canned responses, built once; ClaudeAPIBackend only reads them
+_RESP_HELLO = _make_mock_anthropic_response(
+    text="I am Claude, nice to meet you!",
+    model="claude-sonnet-4-5-20250929",
+    input_tokens=15,
+    output_tokens=30,
+)
+_RESP_ANSWER1 = _make_mock_anthropic_response(text="Answer 1")
+_RESP_ANSWER2 = _make_mock_anthropic_response(text="Answer 2")
+_RESP_CUSTOM = _make_mock_anthropic_response(text="Custom response")
 
-@pytest.mark.asyncio
-async def test_router_routes_to_ws_bridge():
-    """TUT-B009b: Router dispatches to ws-bridge backend."""
-    router = IntegrationRouter()
-
-    mock_backend = MagicMock()
-    mock_backend.send = AsyncMock(
-        return_value={"success": True, "message": "ok", "response": "bridged"}
-    )
-    router._backends["ws-bridge"] = mock_backend
-
-    result = await router.send("Test input", backend="ws-bridge")
-
-    mock_backend.send.assert_awaited_once_with("Test input", {})
-    assert result["success"] is True
-    assert result["backend"] == "ws-bridge"
 
+# ============================================================================
+# TUT-B009: IntegrationRouter routes to correct backend
+# ============================================================================
 
-@pytest.mark.asyncio
-async def test_router_routes_to_mcp_server():
-    """TUT-B009c: Router dispatches to mcp-server backend."""
-    router = IntegrationRouter()
 
-    mock_backend = MagicMock()
-    mock_backend.send = AsyncMock(
-        return_value={"success": True, "message": "ok", "response": ""}
+@pytest.mark.parametrize(
+    "backend_name,text,response",
+    [
+        ("claude-api", "Hello", "mocked"),
+        ("ws-bridge", "Test input", "bridged"),
+        ("mcp-server", "Transcribed text", ""),
+    ],
+)
+async def test_router_routes_to_backend(router, backend_name, text, response):
+    """TUT-B009a-c: Router dispatches to the named backend."""
+    # Inject a mock backend; the router only calls .send
+    mock_backend = SimpleNamespace(
+        send=AsyncMock(return_value={"success": True, "message": "ok", "response": response})
     )
-    router._backends["mcp-server"] = mock_backend
+    router._backends[backend_name] = mock_backend
 
-    result = await router.send("Transcribed text", backend="mcp-server")
+    result = await router.send(text, backend=backend_name)
 
-    mock_backend.send.assert_awaited_once_with("Transcribed text", {})
+    mock_backend.send.assert_awaited_once_with(text, {})
     assert result["success"] is True
-    assert result["backend"] == "mcp-server"
+    assert result["backend"] == backend_name
+    assert result["response"] == response
 
 
-@pytest.mark.asyncio
-async def test_router_uses_active_backend_when_none_specified():
+async def test_router_uses_active_backend_when_none_specified(router):
     """TUT-B009d: Router falls back to active_backend when backend is None."""
-    router = IntegrationRouter()
     router._active_backend = "mcp-server"
 
-    mock_backend = MagicMock()
-    mock_backend.send = AsyncMock(
-        return_value={"success": True, "message": "ok", "response": ""}
+    mock_backend = SimpleNamespace(
+        send=AsyncMock(return_value={"success": True, "message": "ok", "response": ""})
     )
     router._backends["mcp-server"] = mock_backend
 
@@ -136,20 +151,12 @@ async def test_router_uses_active_backend_when_none_specified():
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_claude_api_sends_message():
     """TUT-B010: ClaudeAPIBackend calls Anthropic SDK and returns response."""
     backend = ClaudeAPIBackend(api_key="test-key-12345")
 
-    mock_response = _make_mock_anthropic_response(
-        text="I am Claude, nice to meet you!",
-        model="claude-sonnet-4-5-20250929",
-        input_tokens=15,
-        output_tokens=30,
-    )
-
     mock_client = MagicMock()
-    mock_client.messages.create.return_value = mock_response
+    mock_client.messages.create.return_value = _RESP_HELLO
     backend._client = mock_client
 
     result = await backend.send("Hello Claude!")
@@ -162,10 +169,11 @@ async def test_claude_api_sends_message():
 
     # Verify SDK was called with correct parameters
     mock_client.messages.create.assert_called_once()
-    call_kwargs = mock_client.messages.create.call_args
-    assert call_kwargs.kwargs["model"] == "claude-sonnet-4-5-20250929"
-    assert len(call_kwargs.kwargs["messages"]) == 1
-    assert call_kwargs.kwargs["messages"][0]["content"] == "Hello Claude!"
+    call_kwargs = mock_client.messages.create.call_args.kwargs
+    messages = call_kwargs["messages"]
+    assert call_kwargs["model"] == "claude-sonnet-4-5-20250929"
+    assert len(messages) == 1
+    assert messages[0]["content"] == "Hello Claude!"
 
 
 # ============================================================================
@@ -173,11 +181,8 @@ async def test_claude_api_sends_message():
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_router_unknown_backend_returns_error():
+async def test_router_unknown_backend_returns_error(router):
     """TUT-B011: Router returns error dict for an unregistered backend name."""
-    router = IntegrationRouter()
-
     result = await router.send("text", backend="nonexistent-backend")
 
     assert result["success"] is False
@@ -190,12 +195,9 @@ async def test_router_unknown_backend_returns_error():
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_claude_api_no_key_returns_error():
     """TUT-B012: ClaudeAPIBackend returns error when no API key is configured."""
-    # Make sure env var is not set for this test
-    with patch.dict("os.environ", {}, clear=True):
-        backend = ClaudeAPIBackend(api_key=None)
+    backend = ClaudeAPIBackend(api_key=None, env={})
 
     result = await backend.send("Hello?")
 
@@ -206,9 +208,7 @@ async def test_claude_api_no_key_returns_error():
 
 def test_claude_api_is_configured_property():
     """TUT-B012b: is_configured returns False without key, True with key."""
-    backend_no_key = ClaudeAPIBackend(api_key=None)
-    # Explicitly clear the attribute since env var might be set
-    backend_no_key._api_key = None
+    backend_no_key = ClaudeAPIBackend(api_key=None, env={})
     assert backend_no_key.is_configured is False
 
     backend_with_key = ClaudeAPIBackend(api_key="sk-test")
@@ -220,19 +220,13 @@ def test_claude_api_is_configured_property():
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_ws_bridge_sends_via_subprocess():
     """TUT-B013a: WebSocketBridgeBackend sends text via claude --print subprocess."""
     backend = WebSocketBridgeBackend(claude_path="/usr/bin/claude")
 
-    mock_process = AsyncMock()
-    mock_process.communicate.return_value = (
-        b"Response from Claude Code",
-        b"",
-    )
-    mock_process.returncode = 0
+    proc = _fake_proc(b"Response from Claude Code", b"", 0)
 
-    with patch("asyncio.create_subprocess_exec", return_value=mock_process) as mock_exec:
+    with patch("asyncio.create_subprocess_exec", return_value=proc) as mock_exec:
         result = await backend.send("What is 2+2?")
 
     assert result["success"] is True
@@ -240,12 +234,10 @@ async def test_ws_bridge_sends_via_subprocess():
 
     # Verify subprocess was called correctly
     mock_exec.assert_awaited_once()
-    args = mock_exec.call_args
-    assert args[0][0] == "/usr/bin/claude"
-    assert args[0][1] == "--print"
+    args = mock_exec.call_args.args
+    assert args[:2] == ("/usr/bin/claude", "--print")
 
 
-@pytest.mark.asyncio
 async def test_ws_bridge_not_found():
     """TUT-B013b: WebSocketBridgeBackend returns error when claude CLI is missing."""
     backend = WebSocketBridgeBackend(claude_path=None)
@@ -259,19 +251,13 @@ async def test_ws_bridge_not_found():
     assert "not found" in result["message"].lower()
 
 
-@pytest.mark.asyncio
 async def test_ws_bridge_nonzero_exit():
     """TUT-B013c: WebSocketBridgeBackend handles non-zero exit code."""
     backend = WebSocketBridgeBackend(claude_path="/usr/bin/claude")
 
-    mock_process = AsyncMock()
-    mock_process.communicate.return_value = (
-        b"",
-        b"Error: something went wrong",
-    )
-    mock_process.returncode = 1
+    proc = _fake_proc(b"", b"Error: something went wrong", 1)
 
-    with patch("asyncio.create_subprocess_exec", return_value=mock_process):
+    with patch("asyncio.create_subprocess_exec", return_value=proc):
         result = await backend.send("Bad input")
 
     assert result["success"] is False
@@ -283,11 +269,20 @@ async def test_ws_bridge_nonzero_exit():
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_mcp_server_writes_file(tmp_path):
+@pytest.fixture()
+def exchange_dir(request):
+    """An in-memory directory via pyfakefs when installed, else tmp_path."""
+    try:
+        fs = request.getfixturevalue("fs")
+    except pytest.FixtureLookupError:
+        return request.getfixturevalue("tmp_path")
+    return Path(fs.create_dir("/exchange").path)
+
+
+async def test_mcp_server_writes_file(exchange_dir):
     """TUT-B014a: MCPServerBackend writes transcribed text to exchange file."""
-    input_file = tmp_path / "voice-input.txt"
-    output_file = tmp_path / "voice-output.txt"
+    input_file = exchange_dir / "voice-input.txt"
+    output_file = exchange_dir / "voice-output.txt"
 
     backend = MCPServerBackend(
         input_path=input_file,
@@ -309,10 +304,9 @@ async def test_mcp_server_writes_file(tmp_path):
     assert "Language: en" in content
 
 
-@pytest.mark.asyncio
-async def test_mcp_server_returns_path(tmp_path):
+async def test_mcp_server_returns_path(exchange_dir):
     """TUT-B014b: MCPServerBackend includes file path in response."""
-    input_file = tmp_path / "input.txt"
+    input_file = exchange_dir / "input.txt"
     backend = MCPServerBackend(input_path=input_file, wait_for_response=False)
 
     result = await backend.send("test")
@@ -326,9 +320,8 @@ async def test_mcp_server_returns_path(tmp_path):
 # ============================================================================
 
 
-def test_router_list_backends():
+def test_router_list_backends(router):
     """TUT-B015: list_backends returns all three supported backend names."""
-    router = IntegrationRouter()
     backends = router.list_backends()
 
     assert "claude-api" in backends
@@ -339,14 +332,11 @@ def test_router_list_backends():
 
 def test_router_active_backend_default():
     """TUT-B015b: Default active backend is claude-api."""
-    router = IntegrationRouter()
-    assert router.active_backend == "claude-api"
+    assert IntegrationRouter().active_backend == "claude-api"
 
 
-def test_router_set_active_backend():
+def test_router_set_active_backend(router):
     """TUT-B015c: active_backend setter validates names."""
-    router = IntegrationRouter()
-
     router.active_backend = "ws-bridge"
     assert router.active_backend == "ws-bridge"
 
@@ -359,14 +349,12 @@ def test_router_set_active_backend():
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_claude_api_maintains_history():
     """TUT-B016a: ClaudeAPIBackend keeps conversation history across calls."""
     backend = ClaudeAPIBackend(api_key="test-key")
 
-    mock_response = _make_mock_anthropic_response(text="Answer 1")
     mock_client = MagicMock()
-    mock_client.messages.create.return_value = mock_response
+    mock_client.messages.create.side_effect = [_RESP_ANSWER1, _RESP_ANSWER2]
     backend._client = mock_client
 
     await backend.send("Question 1")
@@ -378,19 +366,15 @@ async def test_claude_api_maintains_history():
     assert backend._conversation_history[1]["content"] == "Answer 1"
 
     # Second message should include history
-    mock_response2 = _make_mock_anthropic_response(text="Answer 2")
-    mock_client.messages.create.return_value = mock_response2
-
     await backend.send("Question 2")
 
     assert len(backend._conversation_history) == 4  # 2 user + 2 assistant
     # Check the messages list passed to the API
-    last_call = mock_client.messages.create.call_args
-    assert len(last_call.kwargs["messages"]) == 3  # 2 history + 1 new
+    last_kwargs = mock_client.messages.create.call_args.kwargs
+    assert len(last_kwargs["messages"]) == 3  # 2 history + 1 new
 
 
-@pytest.mark.asyncio
-async def test_claude_api_clear_history():
+def test_claude_api_clear_history():
     """TUT-B016b: clear_history empties the conversation buffer."""
     backend = ClaudeAPIBackend(api_key="test-key")
     backend._conversation_history = [
@@ -403,7 +387,6 @@ async def test_claude_api_clear_history():
     assert len(backend._conversation_history) == 0
 
 
-@pytest.mark.asyncio
 async def test_claude_api_error_removes_failed_message():
     """TUT-B016c: On API error, user message is removed from history for retry."""
     backend = ClaudeAPIBackend(api_key="test-key")
@@ -418,14 +401,12 @@ async def test_claude_api_error_removes_failed_message():
     assert len(backend._conversation_history) == 0  # failed msg removed
 
 
-@pytest.mark.asyncio
 async def test_claude_api_per_request_overrides():
     """TUT-B016d: Metadata overrides model, system_prompt, max_tokens."""
     backend = ClaudeAPIBackend(api_key="test-key")
 
-    mock_response = _make_mock_anthropic_response(text="Custom response")
     mock_client = MagicMock()
-    mock_client.messages.create.return_value = mock_response
+    mock_client.messages.create.return_value = _RESP_CUSTOM
     backend._client = mock_client
 
     await backend.send(
@@ -7,20 +7,23 @@ Test IDs:
     TUT-B019: Refiner fallback on provider error
     TUT-B020: Refiner uses custom prompt
     TUT-B021: Refiner handles empty text
+    TUT-B071: Identical concurrent requests share one provider call
+    TUT-B073: Repeated requests are served from the result cache
+    TUT-B075: Provider failures are classified by exception type
+    TUT-B078: Short inputs pass through and long inputs are chunked
+    TUT-B079: Provider model lists are cached until config changes
+    TUT-B087: Saving API keys rewrites only their lines in .env
 """
 
-import sys
-from pathlib import Path
+import asyncio
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
-backend_src = Path(__file__).resolve().parents[3] / "src" / "backend"
-if str(backend_src) not in sys.path:
-    sys.path.insert(0, str(backend_src))
-
-from app.refiner.providers.base import RefinerResult
-from app.refiner.refiner import Refiner
+from app.refiner.providers.base import FallbackModelList, RefinerResult
+from app.refiner.refiner import Refiner, _update_env_file
 
 
 # ============================================================================
@@ -28,7 +31,6 @@ from app.refiner.refiner import Refiner
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_refiner_disabled_returns_raw_text():
     """TUT-B017: When refiner is disabled, raw text is returned unchanged."""
     refiner = Refiner()
@@ -46,22 +48,23 @@ async def test_refiner_disabled_returns_raw_text():
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_refiner_processes_text_with_mock_provider():
     """TUT-B018: Refiner calls the active provider and returns its result."""
     refiner = Refiner()
     refiner._enabled = True
     refiner._active_provider = "ollama"
 
-    mock_provider = MagicMock()
-    mock_provider.refine = AsyncMock(
-        return_value=RefinerResult(
-            refined_text="Hello world.",
-            provider="ollama",
-            model="llama3.2",
-            processing_time_ms=42.0,
-            tokens_used=15,
-        )
+    mock_provider = SimpleNamespace(
+        refine=AsyncMock(
+            return_value=RefinerResult(
+                refined_text="Hello world.",
+                provider="ollama",
+                model="llama3.2",
+                processing_time_ms=42.0,
+                tokens_used=15,
+            )
+        ),
+        get_info=lambda: {"name": "ollama", "model": "llama3.2", "configured": True},
     )
     refiner._providers["ollama"] = mock_provider
 
@@ -78,7 +81,6 @@ async def test_refiner_processes_text_with_mock_provider():
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_refiner_fallback_on_provider_error():
     """TUT-B019: On provider failure, refiner returns raw text unchanged."""
     refiner = Refiner()
@@ -100,7 +102,6 @@ async def test_refiner_fallback_on_provider_error():
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_refiner_uses_custom_prompt():
     """TUT-B020: Custom prompt additions are passed to the provider."""
     refiner = Refiner()
@@ -130,7 +131,6 @@ async def test_refiner_uses_custom_prompt():
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_refiner_handles_empty_text():
     """TUT-B021: Empty or whitespace text is returned without calling provider."""
     refiner = Refiner()
@@ -143,3 +143,265 @@ async def test_refiner_handles_empty_text():
     result_whitespace = await refiner.process("   ")
     assert result_whitespace.refined_text == "   "
     assert result_whitespace.provider == "none"
+
+
+# ============================================================================
+# TUT-B071: Identical concurrent requests share one provider call
+# ============================================================================
+
+
+async def test_refiner_deduplicates_concurrent_identical_requests():
+    """TUT-B071: Concurrent identical requests await a single provider call."""
+    refiner = Refiner()
+    refiner._enabled = True
+    refiner._active_provider = "ollama"
+
+    release = asyncio.Event()
+
+    async def _slow_refine(*args, **kwargs):
+        await release.wait()
+        return RefinerResult(refined_text="Hello.", provider="ollama", model="llama3.2")
+
+    mock_provider = MagicMock()
+    mock_provider.refine = AsyncMock(side_effect=_slow_refine)
+    refiner._providers["ollama"] = mock_provider
+
+    tasks = [asyncio.ensure_future(refiner.process("hello")) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert [r.refined_text for r in results] == ["Hello."] * 3
+    assert mock_provider.refine.await_count == 1
+
+
+async def test_refiner_dedup_key_includes_model():
+    """TUT-B071: A request after a model change doesn't join the old model's call."""
+    refiner = Refiner()
+    refiner._enabled = True
+    refiner._active_provider = "ollama"
+
+    release = asyncio.Event()
+    mock_provider = MagicMock()
+    mock_provider.get_info.return_value = {"model": "old"}
+
+    async def _slow_refine(*args, **kwargs):
+        model = mock_provider.get_info.return_value["model"]
+        await release.wait()
+        return RefinerResult(refined_text=f"From {model}.", provider="ollama", model=model)
+
+    mock_provider.refine = AsyncMock(side_effect=_slow_refine)
+    refiner._providers["ollama"] = mock_provider
+
+    first = asyncio.ensure_future(refiner.process("hello"))
+    await asyncio.sleep(0)
+    mock_provider.get_info.return_value = {"model": "new"}
+    second = asyncio.ensure_future(refiner.process("hello"))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert (await first).refined_text == "From old."
+    assert (await second).refined_text == "From new."
+    assert mock_provider.refine.await_count == 2
+
+
+# ============================================================================
+# TUT-B073: Repeated requests are served from the result cache
+# ============================================================================
+
+
+async def test_refiner_caches_repeated_requests():
+    """TUT-B073: A repeat of the same text and prompt skips the provider."""
+    refiner = Refiner()
+    refiner._enabled = True
+    refiner._active_provider = "ollama"
+
+    mock_provider = MagicMock()
+    mock_provider.get_info.return_value = {"name": "ollama", "model": "llama3.2"}
+    mock_provider.refine = AsyncMock(
+        return_value=RefinerResult(refined_text="Period.", provider="ollama", model="llama3.2")
+    )
+    refiner._providers["ollama"] = mock_provider
+
+    first = await refiner.process("period")
+    second = await refiner.process("period")
+    await refiner.process("period", prompt_override="Other prompt.")
+
+    assert first.refined_text == second.refined_text == "Period."
+    assert second is not first
+    assert second.processing_time_ms == 0.0
+    assert mock_provider.refine.await_count == 2
+
+
+# ============================================================================
+# TUT-B075: Provider failures are classified by exception type
+# ============================================================================
+
+
+async def test_refiner_classifies_errors_by_type():
+    """TUT-B075: Status codes and timeout classes drive the fallback warning."""
+    refiner = Refiner()
+    refiner._enabled = True
+    refiner._active_provider = "ollama"
+
+    request = httpx.Request("POST", "https://example.invalid/v1/chat")
+    rate_limited = httpx.HTTPStatusError(
+        "Too Many Requests", request=request, response=httpx.Response(429, request=request)
+    )
+    mock_provider = MagicMock()
+    mock_provider.refine = AsyncMock(side_effect=[rate_limited, httpx.ReadTimeout("read stalled")])
+    refiner._providers["ollama"] = mock_provider
+
+    limited = await refiner.process("first")
+    timed_out = await refiner.process("second")
+
+    assert limited.warning.startswith("Rate limited by ollama")
+    assert "timed out" in timed_out.warning
+
+
+# ============================================================================
+# TUT-B078: Short inputs pass through and long inputs are chunked
+# ============================================================================
+
+
+async def test_refiner_size_thresholds():
+    """TUT-B078: Below min_refine_chars skips the provider; above max splits, keeping breaks."""
+    refiner = Refiner()
+    refiner._enabled = True
+    refiner._active_provider = "ollama"
+    refiner._min_refine_chars = 4
+    refiner._max_refine_chars = 40
+
+    async def _upper(text, prompt, timeout):
+        inner = text.removeprefix("<transcription>\n").removesuffix("\n</transcription>")
+        return RefinerResult(refined_text=inner.upper(), provider="ollama", model="llama3.2", tokens_used=5)
+
+    mock_provider = MagicMock()
+    mock_provider.refine = AsyncMock(side_effect=_upper)
+    refiner._providers["ollama"] = mock_provider
+
+    short = await refiner.process("ok")
+    assert short.refined_text == "ok"
+    assert short.provider == "too-short"
+    assert mock_provider.refine.await_count == 0
+
+    long_text = "This is the first sentence. This is the second one.\n\n- a bullet\n- another"
+    result = await refiner.process(long_text)
+
+    # Split into three chunks; the original breaks survive the rejoin
+    assert mock_provider.refine.await_count == 3
+    assert result.refined_text == long_text.upper()
+    assert result.tokens_used == 15
+
+
+async def test_refiner_stream_splits_long_input():
+    """TUT-B078: process_stream chunks long inputs like process() and keeps the breaks."""
+    refiner = Refiner()
+    refiner._enabled = True
+    refiner._active_provider = "ollama"
+    refiner._max_refine_chars = 40
+    calls = []
+
+    async def _upper_stream(text, prompt, timeout):
+        calls.append(text)
+        inner = text.removeprefix("<transcription>\n").removesuffix("\n</transcription>")
+        yield inner[:5].upper()
+        yield inner[5:].upper()
+
+    mock_provider = MagicMock()
+    mock_provider.refine_stream = _upper_stream
+    mock_provider.get_info.return_value = {"model": "llama3.2"}
+    refiner._providers["ollama"] = mock_provider
+
+    long_text = "This is the first sentence. This is the second one.\n\n- a bullet\n- another"
+    events = [e async for e in refiner.process_stream(long_text)]
+
+    assert len(calls) == 3
+    assert "".join(e["delta"] for e in events if "delta" in e) == long_text.upper()
+    assert events[-1]["done"] is True
+    assert "warning" not in events[-1]
+
+
+async def test_refiner_size_thresholds_validated(monkeypatch):
+    """TUT-B078: Negative thresholds and a max below the min are rejected unchanged."""
+    refiner = Refiner()
+    monkeypatch.setattr(refiner, "_save_persistent_config", lambda: None)
+    await refiner.configure(enabled=True, min_refine_chars=10, max_refine_chars=0)
+
+    for kwargs in ({"min_refine_chars": -1}, {"max_refine_chars": -5}, {"max_refine_chars": 5}):
+        with pytest.raises(ValueError):
+            await refiner.configure(enabled=False, **kwargs)
+
+    assert (refiner._enabled, refiner._min_refine_chars, refiner._max_refine_chars) == (True, 10, 0)
+
+
+# ============================================================================
+# TUT-B079: Provider model lists are cached until config changes
+# ============================================================================
+
+
+async def test_refiner_caches_model_lists(monkeypatch):
+    """TUT-B079: Repeat list_models calls reuse the result until configure()."""
+    refiner = Refiner()
+    monkeypatch.setattr(refiner, "_save_persistent_config", lambda: None)
+
+    mock_provider = MagicMock()
+    mock_provider.list_models = AsyncMock(return_value=[{"id": "llama3.2", "name": "llama3.2"}])
+    refiner._providers["ollama"] = mock_provider
+
+    await refiner.list_models("ollama")
+    await refiner.list_models("ollama")
+    assert mock_provider.list_models.await_count == 1
+
+    await refiner.configure(provider_models={"ollama": [{"id": "mine", "name": "Mine"}]})
+    await refiner.list_models("ollama")
+    assert mock_provider.list_models.await_count == 2
+
+
+async def test_refiner_model_list_cache_skips_fallbacks_and_copies():
+    """TUT-B079: Fallback lists are not cached, and callers get their own copy."""
+    refiner = Refiner()
+
+    mock_provider = MagicMock()
+    mock_provider.list_models = AsyncMock(
+        return_value=FallbackModelList([{"id": "llama3.2", "name": "llama3.2"}])
+    )
+    refiner._providers["ollama"] = mock_provider
+
+    await refiner.list_models("ollama")
+    await refiner.list_models("ollama")
+    assert mock_provider.list_models.await_count == 2
+
+    mock_provider.list_models.return_value = [{"id": "live", "name": "live"}]
+    first = await refiner.list_models("ollama")
+    first[0]["name"] = "changed"
+    first.append({"id": "extra", "name": "extra"})
+    assert await refiner.list_models("ollama") == [{"id": "live", "name": "live"}]
+    assert mock_provider.list_models.await_count == 3
+
+
+# ============================================================================
+# TUT-B087: Saving API keys rewrites only their lines in .env
+# ============================================================================
+
+
+def test_update_env_file_keeps_other_lines(isolated_refiner_config):
+    """TUT-B087: Comments, export prefixes and ${VAR} references survive a key update."""
+    isolated_refiner_config.mkdir()
+    env_file = isolated_refiner_config / ".env"
+    env_file.write_text(
+        "# Refiner keys\n"
+        "export GROQ_API_KEY='old-key'\n"
+        "\n"
+        "OPENAI_API_KEY=${SHARED_OPENAI_KEY}"
+    )
+
+    _update_env_file({"GROQ_API_KEY": "new-key", "GEMINI_API_KEY": "gem-key"})
+
+    assert env_file.read_text() == (
+        "# Refiner keys\n"
+        "export GROQ_API_KEY='new-key'\n"
+        "\n"
+        "OPENAI_API_KEY=${SHARED_OPENAI_KEY}\n"
+        "GEMINI_API_KEY='gem-key'\n"
+    )
@@ -10,68 +10,19 @@ Test IDs:
     TUT-B048: GET /refiner/providers returns all providers
     TUT-B049: GET /refiner/providers/{name}/models returns model list
     TUT-B050: GET /refiner/providers/{name}/models returns 400 for unknown
+    TUT-B070: Refinement is cancelled when the client disconnects
+    TUT-B076: POST /refiner/process/stream streams refined text as SSE
+    TUT-B077: Explicit refine calls run while disabled without flipping the toggle
 """
 
-import sys
-from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
 
-import pytest
+from app.refiner.providers.base import BaseRefinerProvider, RefinerResult
+from app.refiner_api import _sse_events
 
-backend_src = Path(__file__).resolve().parents[3] / "src" / "backend"
-if str(backend_src) not in sys.path:
-    sys.path.insert(0, str(backend_src))
-
-from app.refiner.providers.base import RefinerResult
-from app.refiner.refiner import Refiner
-
-
-# ============================================================================
-# Fixtures
-# ============================================================================
-
-
-@pytest.fixture()
-def refiner_client(test_client, monkeypatch):
-    """
-    Provide a test client with a mocked refiner singleton.
-
-    Reuses the test_client fixture from conftest.py and patches
-    the refiner module singleton.
-    """
-    mock_refiner = Refiner()
-    mock_refiner._enabled = True
-    mock_refiner._active_provider = "ollama"
-
-    # Inject a mock provider
-    mock_provider = MagicMock()
-    mock_provider.refine = AsyncMock(
-        return_value=RefinerResult(
-            refined_text="Refined output.",
-            provider="ollama",
-            model="llama3.2",
-            processing_time_ms=50.0,
-            tokens_used=20,
-        )
-    )
-    mock_provider.is_configured.return_value = True
-    mock_provider.list_models = AsyncMock(
-        return_value=[
-            {"id": "llama3.2", "name": "llama3.2"},
-            {"id": "llama3.1", "name": "llama3.1"},
-        ]
-    )
-    mock_provider.get_info.return_value = {
-        "name": "ollama",
-        "model": "llama3.2",
-        "configured": True,
-    }
-    mock_refiner._providers["ollama"] = mock_provider
-
-    monkeypatch.setattr("app.refiner_api.get_refiner", lambda: mock_refiner)
-    monkeypatch.setattr("app.refiner.get_refiner", lambda: mock_refiner)
-
-    return test_client
+_EXPECTED_PROVIDERS = frozenset({"claude-cli", "anthropic", "openai", "groq", "ollama", "gemini"})
 
 
 # ============================================================================
@@ -79,7 +30,6 @@ def refiner_client(test_client, monkeypatch):
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_process_endpoint_returns_refined_text(refiner_client):
     """TUT-B031: /refiner/process returns refined text from provider."""
     response = await refiner_client.post(
@@ -99,7 +49,6 @@ async def test_process_endpoint_returns_refined_text(refiner_client):
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_process_endpoint_invalid_provider(refiner_client):
     """TUT-B032: /refiner/process returns 400 for unknown provider."""
     response = await refiner_client.post(
@@ -117,21 +66,12 @@ async def test_process_endpoint_invalid_provider(refiner_client):
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_process_endpoint_provider_error_fallback(test_client, monkeypatch):
+async def test_process_endpoint_provider_error_fallback(refiner_client, mock_refiner):
     """TUT-B033: On provider error, endpoint returns raw text as fallback."""
-    mock_refiner = Refiner()
-    mock_refiner._enabled = True
-    mock_refiner._active_provider = "ollama"
-
     # Provider that always fails
-    mock_provider = MagicMock()
-    mock_provider.refine = AsyncMock(side_effect=Exception("Provider down"))
-    mock_refiner._providers["ollama"] = mock_provider
-
-    monkeypatch.setattr("app.refiner_api.get_refiner", lambda: mock_refiner)
+    mock_refiner._providers["ollama"].refine = AsyncMock(side_effect=Exception("Provider down"))
 
-    response = await test_client.post(
+    response = await refiner_client.post(
         "/refiner/process",
         json={"text": "raw input text"},
     )
@@ -148,17 +88,13 @@ async def test_process_endpoint_provider_error_fallback(test_client, monkeypatch
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_config_endpoint_returns_config(refiner_client):
     """TUT-B034: /refiner/config returns current refiner configuration."""
     response = await refiner_client.get("/refiner/config")
 
     assert response.status_code == 200
     data = response.json()
-    assert "enabled" in data
-    assert "active_provider" in data
-    assert "timeout" in data
-    assert "providers" in data
+    assert data.keys() >= {"enabled", "active_provider", "timeout", "providers"}
 
 
 # ============================================================================
@@ -166,7 +102,6 @@ async def test_config_endpoint_returns_config(refiner_client):
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_test_endpoint_returns_result(refiner_client):
     """TUT-B035: /refiner/test returns original and refined text."""
     response = await refiner_client.post(
@@ -176,9 +111,7 @@ async def test_test_endpoint_returns_result(refiner_client):
 
     assert response.status_code == 200
     data = response.json()
-    assert "original" in data
-    assert "refined_text" in data
-    assert "provider" in data
+    assert data.keys() >= {"original", "refined_text", "provider"}
 
 
 # ============================================================================
@@ -186,26 +119,18 @@ async def test_test_endpoint_returns_result(refiner_client):
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_providers_endpoint_returns_all(refiner_client):
-    """TUT-B048: /refiner/providers returns list of all 5 providers."""
+    """TUT-B048: /refiner/providers returns list of all 6 providers."""
     response = await refiner_client.get("/refiner/providers")
 
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
     assert len(data) == 6
-    ids = [p["id"] for p in data]
-    assert "anthropic" in ids
-    assert "openai" in ids
-    assert "groq" in ids
-    assert "ollama" in ids
-    assert "gemini" in ids
+    assert {p["id"] for p in data} == _EXPECTED_PROVIDERS
     # Each provider has required fields
     for p in data:
-        assert "name" in p
-        assert "requires_api_key" in p
-        assert "configured" in p
+        assert p.keys() >= {"name", "requires_api_key", "configured"}
 
 
 # ============================================================================
@@ -213,7 +138,6 @@ async def test_providers_endpoint_returns_all(refiner_client):
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_provider_models_endpoint(refiner_client):
     """TUT-B049: /refiner/providers/{name}/models returns models."""
     response = await refiner_client.get("/refiner/providers/ollama/models")
@@ -231,7 +155,6 @@ async def test_provider_models_endpoint(refiner_client):
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_provider_models_unknown_provider(refiner_client):
     """TUT-B050: /refiner/providers/{name}/models returns 400 for unknown."""
     response = await refiner_client.get("/refiner/providers/nonexistent/models")
@@ -246,22 +169,18 @@ async def test_provider_models_unknown_provider(refiner_client):
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_provider_models_with_custom_config(test_client, monkeypatch):
+async def test_provider_models_with_custom_config(refiner_client, mock_refiner):
     """TUT-B057: Custom models from config are passed to provider.list_models."""
-    mock_refiner = Refiner()
     custom = [{"id": "custom-model", "name": "Custom Model"}]
     mock_refiner._provider_models = {"anthropic": custom}
 
-    mock_provider = MagicMock()
+    mock_provider = MagicMock(spec=BaseRefinerProvider)
     mock_provider.list_models = AsyncMock(return_value=custom)
     mock_provider.is_configured.return_value = True
     mock_provider.get_info.return_value = {"name": "anthropic", "model": "custom-model", "configured": True}
     mock_refiner._providers["anthropic"] = mock_provider
 
-    monkeypatch.setattr("app.refiner_api.get_refiner", lambda: mock_refiner)
-
-    response = await test_client.get("/refiner/providers/anthropic/models")
+    response = await refiner_client.get("/refiner/providers/anthropic/models")
     assert response.status_code == 200
     data = response.json()
     assert data == custom
@@ -274,22 +193,10 @@ async def test_provider_models_with_custom_config(test_client, monkeypatch):
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_config_preserves_provider_models(test_client, monkeypatch):
+async def test_config_preserves_provider_models(refiner_client):
     """TUT-B058: PUT /refiner/config with provider_models preserves them in get_config."""
-    mock_refiner = Refiner()
-
-    mock_provider = MagicMock()
-    mock_provider.is_configured.return_value = True
-    mock_provider.get_info.return_value = {"name": "ollama", "model": "llama3.2", "configured": True}
-    mock_refiner._providers["ollama"] = mock_provider
-
-    monkeypatch.setattr("app.refiner_api.get_refiner", lambda: mock_refiner)
-    # Prevent file I/O
-    monkeypatch.setattr(mock_refiner, "_save_persistent_config", lambda: None)
-
     custom = {"anthropic": [{"id": "my-claude", "name": "My Claude"}]}
-    response = await test_client.put(
+    response = await refiner_client.put(
         "/refiner/config",
         json={"provider_models": custom},
     )
@@ -304,22 +211,15 @@ async def test_config_preserves_provider_models(test_client, monkeypatch):
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_provider_test_connection_success(test_client, monkeypatch):
+async def test_provider_test_connection_success(refiner_client, mock_refiner):
     """TUT-B059: /refiner/providers/{name}/test-connection returns ok result."""
-    mock_refiner = Refiner()
 
-    mock_provider = MagicMock()
-    mock_provider.test_connection = AsyncMock(
-        return_value={"ok": True, "latency_ms": 42.0, "message": "Connected. 5 model(s) available."}
-    )
-    mock_provider.is_configured.return_value = True
-    mock_provider.get_info.return_value = {"name": "ollama", "model": "llama3.2", "configured": True}
-    mock_refiner._providers["ollama"] = mock_provider
+    async def _test_connection():
+        return {"ok": True, "latency_ms": 42.0, "message": "Connected. 5 model(s) available."}
 
-    monkeypatch.setattr("app.refiner_api.get_refiner", lambda: mock_refiner)
+    mock_refiner._providers["ollama"].test_connection = _test_connection
 
-    response = await test_client.get("/refiner/providers/ollama/test-connection")
+    response = await refiner_client.get("/refiner/providers/ollama/test-connection")
     assert response.status_code == 200
     data = response.json()
     assert data["ok"] is True
@@ -332,10 +232,114 @@ async def test_provider_test_connection_success(test_client, monkeypatch):
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_provider_test_connection_unknown(test_client):
+async def test_provider_test_connection_unknown(refiner_client):
     """TUT-B060: /refiner/providers/{name}/test-connection returns 400 for unknown provider."""
-    response = await test_client.get("/refiner/providers/nonexistent/test-connection")
+    response = await refiner_client.get("/refiner/providers/nonexistent/test-connection")
     assert response.status_code == 400
     data = response.json()
     assert "Unknown provider" in data["error"]
+
+
+# ============================================================================
+# TUT-B070: Refinement is cancelled when the client disconnects
+# ============================================================================
+
+
+async def test_process_cancelled_on_client_disconnect():
+    """TUT-B070: In-flight provider work is cancelled once the client is gone."""
+    from app.refiner_api import _run_unless_disconnected
+
+    class _DisconnectedRequest:
+        async def receive(self):
+            return {"type": "http.disconnect"}
+
+    cancelled = asyncio.Event()
+
+    async def _slow_refine():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    result = await _run_unless_disconnected(_DisconnectedRequest(), _slow_refine())
+
+    assert result is None
+    assert cancelled.is_set()
+
+
+# ============================================================================
+# TUT-B076: POST /refiner/process/stream streams refined text as SSE
+# ============================================================================
+
+
+async def test_process_stream_endpoint_sends_sse(refiner_client, mock_refiner):
+    """TUT-B076: /refiner/process/stream sends delta events then a done event."""
+
+    async def _stream(text, system_prompt, timeout=5.0):
+        for chunk in ("Refined ", "streamed ", "output."):
+            yield chunk
+
+    mock_refiner._providers["ollama"].refine_stream = _stream
+
+    response = await refiner_client.post(
+        "/refiner/process/stream",
+        json={"text": "hello um world"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [
+        json.loads(line[len("data: "):])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    assert "".join(e.get("delta", "") for e in events) == "Refined streamed output."
+    assert events[-1]["done"] is True
+    assert events[-1]["provider"] == "ollama"
+    assert "warning" not in events[-1]
+
+
+async def test_sse_events_flush_buffered_delta_while_stalled():
+    """TUT-B076: A buffered delta goes out after the flush interval even if the provider stalls."""
+    resume = asyncio.Event()
+
+    async def _events():
+        yield {"delta": "Refined "}
+        yield {"delta": "output."}
+        await resume.wait()
+        yield {"done": True}
+
+    frames = _sse_events(_events())
+
+    assert await anext(frames) == b'data: {"delta":"Refined "}\n\n'
+    # Sent while the provider is still stalled, not held until the next event
+    assert await asyncio.wait_for(anext(frames), timeout=1.0) == b'data: {"delta":"output."}\n\n'
+    resume.set()
+    assert await anext(frames) == b'data: {"done":true}\n\n'
+
+
+# ============================================================================
+# TUT-B077: Explicit refine calls run while disabled without flipping the toggle
+# ============================================================================
+
+
+async def test_process_when_disabled_leaves_toggle_off(refiner_client, mock_refiner):
+    """TUT-B077: /refiner/process and /refiner/test refine but never set _enabled."""
+    refiner = mock_refiner
+    refiner._enabled = False
+    seen_enabled = []
+
+    async def _refine(*args, **kwargs):
+        seen_enabled.append(refiner._enabled)
+        return RefinerResult(refined_text="Refined output.", provider="ollama", model="llama3.2")
+
+    refiner._providers["ollama"].refine = AsyncMock(side_effect=_refine)
+
+    processed = await refiner_client.post("/refiner/process", json={"text": "hello"})
+    tested = await refiner_client.post("/refiner/test", json={})
+
+    assert processed.json()["refined_text"] == "Refined output."
+    assert tested.json()["refined_text"] == "Refined output."
+    assert seen_enabled == [False, False]
+    assert refiner._enabled is False
@@ -23,24 +23,41 @@ Test IDs:
     TUT-B045: Anthropic list_models returns hardcoded list
     TUT-B046: OpenAI list_models returns hardcoded list
     TUT-B047: Provider display names and API key requirements
+    TUT-B069: Gemini reuses a context cache for long system prompts
+    TUT-B072: OpenAI/Anthropic send prompt caching hints
+    TUT-B074: OpenAI list_models filters and sorts by version
+    TUT-B088: Mid-stream errors and truncated streams fall back to raw text
+    TUT-B089: Ollama derives its tags URL without losing a path prefix
 """
 
+import itertools
+import json
 import sys
-from pathlib import Path
+import time
+from types import SimpleNamespace
 
 import httpx
 import pytest
 
-backend_src = Path(__file__).resolve().parents[3] / "src" / "backend"
-if str(backend_src) not in sys.path:
-    sys.path.insert(0, str(backend_src))
-
+from app.jsonutil import dumps as json_dumps
 from app.refiner.providers import PROVIDER_REGISTRY
 from app.refiner.providers.anthropic_provider import AnthropicRefinerProvider
+from app.refiner.providers.claude_cli_provider import ClaudeCliRefinerProvider
 from app.refiner.providers.gemini_provider import GeminiRefinerProvider
 from app.refiner.providers.groq_provider import GroqRefinerProvider
 from app.refiner.providers.ollama_provider import OllamaRefinerProvider
 from app.refiner.providers.openai_provider import OpenAIRefinerProvider
+from app.refiner.refiner import Refiner
+
+# Every registered provider name and the class it must map to
+_EXPECTED_REGISTRY = (
+    ("claude-cli", ClaudeCliRefinerProvider),
+    ("anthropic", AnthropicRefinerProvider),
+    ("openai", OpenAIRefinerProvider),
+    ("groq", GroqRefinerProvider),
+    ("ollama", OllamaRefinerProvider),
+    ("gemini", GeminiRefinerProvider),
+)
 
 
 # ============================================================================
@@ -48,134 +65,177 @@ from app.refiner.providers.openai_provider import OpenAIRefinerProvider
 # ============================================================================
 
 
+# Response bodies are serialized once at import; the handlers only wrap them
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_REJECTED_BODY = json_dumps({"error": {"message": "Request rejected"}})
+
+_GROQ_OK_BODY = json_dumps({
+    "choices": [
+        {"message": {"content": "Hello world."}}
+    ],
+    "usage": {"total_tokens": 25},
+})
+
+_OLLAMA_OK_BODY = b"".join(
+    json_dumps(c) + b"\n"
+    for c in (
+        {"message": {"content": "Hello "}, "done": False},
+        {"message": {"content": "world."}, "done": False},
+        {"message": {"content": ""}, "done": True, "eval_count": 18},
+    )
+)
+
+_GEMINI_OK_BODY = json_dumps({
+    "candidates": [
+        {
+            "content": {
+                "parts": [{"text": "Hello world."}],
+            }
+        }
+    ],
+    "usageMetadata": {"totalTokenCount": 30},
+})
+
+_ANTHROPIC_OK_BODY = json_dumps({
+    "content": [{"type": "text", "text": "Hello world."}],
+    "usage": {"input_tokens": 15, "output_tokens": 10},
+})
+
+_OPENAI_OK_BODY = b"".join(
+    b"data: " + json_dumps(c) + b"\n\n"
+    for c in (
+        {"choices": [{"delta": {"role": "assistant", "content": "Hello "}}]},
+        {"choices": [{"delta": {"content": "world."}}]},
+        {"choices": [], "usage": {"total_tokens": 22}},
+    )
+) + b"data: [DONE]\n\n"
+
+
 def _groq_success_response(request: httpx.Request) -> httpx.Response:
     """Mock Groq API success response."""
-    return httpx.Response(
-        200,
-        json={
-            "choices": [
-                {"message": {"content": "Hello world."}}
-            ],
-            "usage": {"total_tokens": 25},
-        },
-    )
+    return httpx.Response(200, content=_GROQ_OK_BODY, headers=_JSON_HEADERS)
 
 
 def _ollama_success_response(request: httpx.Request) -> httpx.Response:
-    """Mock Ollama API success response."""
+    """Mock Ollama API success response (streamed NDJSON)."""
     return httpx.Response(
         200,
-        json={
-            "message": {"content": "Hello world."},
-            "eval_count": 18,
-        },
+        content=_OLLAMA_OK_BODY,
+        headers={"Content-Type": "application/x-ndjson"},
     )
 
 
 def _gemini_success_response(request: httpx.Request) -> httpx.Response:
     """Mock Gemini API success response."""
-    return httpx.Response(
-        200,
-        json={
-            "candidates": [
-                {
-                    "content": {
-                        "parts": [{"text": "Hello world."}],
-                    }
-                }
-            ],
-            "usageMetadata": {"totalTokenCount": 30},
-        },
-    )
+    return httpx.Response(200, content=_GEMINI_OK_BODY, headers=_JSON_HEADERS)
 
 
 def _anthropic_success_response(request: httpx.Request) -> httpx.Response:
     """Mock Anthropic API success response."""
-    return httpx.Response(
-        200,
-        json={
-            "content": [{"type": "text", "text": "Hello world."}],
-            "usage": {"input_tokens": 15, "output_tokens": 10},
-        },
-    )
+    return httpx.Response(200, content=_ANTHROPIC_OK_BODY, headers=_JSON_HEADERS)
 
 
 def _openai_success_response(request: httpx.Request) -> httpx.Response:
-    """Mock OpenAI API success response."""
+    """Mock OpenAI API success response (streamed server-sent events)."""
     return httpx.Response(
         200,
-        json={
-            "choices": [
-                {"message": {"content": "Hello world."}}
-            ],
-            "usage": {"total_tokens": 22},
-        },
+        content=_OPENAI_OK_BODY,
+        headers={"Content-Type": "text/event-stream"},
     )
 
 
-# ============================================================================
-# TUT-B022: Groq sends correct API format
-# ============================================================================
-
-
-@pytest.mark.asyncio
-async def test_groq_sends_correct_api_format():
-    """TUT-B022: Groq provider sends correctly formatted API request."""
-    provider = GroqRefinerProvider(api_key="test-key-123")
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_groq_success_response)
-    )
-
-    result = await provider.refine("hello um world", "Fix the text.", timeout=5.0)
-
-    assert result.refined_text == "Hello world."
-    assert result.provider == "groq"
-    assert result.tokens_used == 25
-    assert result.processing_time_ms > 0
-
-
-# ============================================================================
-# TUT-B023: Groq handles auth error
-# ============================================================================
+_SUCCESS_BY_HOST = {
+    "api.groq.com": _groq_success_response,
+    "generativelanguage.googleapis.com": _gemini_success_response,
+    "api.anthropic.com": _anthropic_success_response,
+    "api.openai.com": _openai_success_response,
+}
 
 
-@pytest.mark.asyncio
-async def test_groq_handles_auth_error():
-    """TUT-B023: Groq provider raises on 401 Unauthorized."""
+def _route_success(request: httpx.Request) -> httpx.Response:
+    """Answer each provider's request with its success response (Ollama is the local fallback)."""
+    return _SUCCESS_BY_HOST.get(request.url.host, _ollama_success_response)(request)
 
-    def _auth_error(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(401, json={"error": {"message": "Invalid API Key"}})
 
-    provider = GroqRefinerProvider(api_key="bad-key")
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_auth_error)
-    )
-
-    with pytest.raises(httpx.HTTPStatusError) as exc_info:
-        await provider.refine("test", "prompt")
-    assert exc_info.value.response.status_code == 401
+@pytest.fixture()
+def fake_perf(monkeypatch):
+    """Freeze the providers' clocks so every refine() takes exactly 50 ms."""
+    ticks = itertools.cycle((0, 50_000_000))
+    fake_time = SimpleNamespace(perf_counter_ns=lambda: next(ticks), monotonic=time.monotonic)
+    for provider_cls in PROVIDER_REGISTRY.values():
+        monkeypatch.setattr(sys.modules[provider_cls.__module__], "time", fake_time)
 
 
 # ============================================================================
-# TUT-B024: Groq handles rate limit
+# TUT-B022/B026/B028/B036/B038: Providers send the correct API format
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_groq_handles_rate_limit():
-    """TUT-B024: Groq provider raises on 429 rate limit."""
+@pytest.mark.parametrize(
+    "provider_cls,kwargs,name,tokens",
+    [
+        (GroqRefinerProvider, {"api_key": "test-key-123"}, "groq", 25),
+        (OllamaRefinerProvider, {"model": "llama3.2"}, "ollama", 18),
+        (GeminiRefinerProvider, {"api_key": "test-key-456"}, "gemini", 30),
+        (AnthropicRefinerProvider, {"api_key": "test-key-789"}, "anthropic", 25),  # 15 in + 10 out
+        (OpenAIRefinerProvider, {"api_key": "test-key-abc"}, "openai", 22),
+    ],
+    ids=[
+        "TUT-B022-groq",
+        "TUT-B026-ollama",
+        "TUT-B028-gemini",
+        "TUT-B036-anthropic",
+        "TUT-B038-openai",
+    ],
+)
+async def test_provider_sends_correct_api_format(
+    provider_cls, kwargs, name, tokens, mock_client_factory, fake_perf
+):
+    """TUT-B022/B026/B028/B036/B038: Each provider parses its API's success response."""
+    provider = provider_cls(**kwargs)
+    provider._client = mock_client_factory(_route_success)
 
-    def _rate_limit(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(429, json={"error": {"message": "Rate limit exceeded"}})
+    result = await provider.refine("hello um world", "Fix the text.", timeout=5.0)
 
-    provider = GroqRefinerProvider(api_key="test-key")
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_rate_limit)
+    assert result.refined_text == "Hello world."
+    assert result.provider == name
+    assert result.tokens_used == tokens
+    assert result.processing_time_ms == 50.0
+
+
+# ============================================================================
+# TUT-B023/B024/B029/B037/B039: Providers raise on HTTP error responses
+# ============================================================================
+
+
+@pytest.mark.parametrize(
+    "provider_cls,status",
+    [
+        (GroqRefinerProvider, 401),
+        (GroqRefinerProvider, 429),
+        (GeminiRefinerProvider, 403),
+        (AnthropicRefinerProvider, 401),
+        (OpenAIRefinerProvider, 401),
+    ],
+    ids=[
+        "TUT-B023-groq-auth",
+        "TUT-B024-groq-rate-limit",
+        "TUT-B029-gemini-auth",
+        "TUT-B037-anthropic-auth",
+        "TUT-B039-openai-auth",
+    ],
+)
+async def test_provider_raises_on_http_error(provider_cls, status, mock_client_factory):
+    """TUT-B023/B024/B029/B037/B039: Auth and rate-limit errors surface as HTTPStatusError."""
+    provider = provider_cls(api_key="bad-key")
+    provider._client = mock_client_factory(
+        lambda request: httpx.Response(status, content=_REJECTED_BODY, headers=_JSON_HEADERS)
     )
 
     with pytest.raises(httpx.HTTPStatusError) as exc_info:
         await provider.refine("test", "prompt")
-    assert exc_info.value.response.status_code == 429
+    assert exc_info.value.response.status_code == status
 
 
 # ============================================================================
@@ -183,105 +243,37 @@ async def test_groq_handles_rate_limit():
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_groq_handles_timeout():
+async def test_groq_handles_timeout(mock_client_factory):
     """TUT-B025: Groq provider raises on request timeout."""
 
     def _timeout(request: httpx.Request) -> httpx.Response:
         raise httpx.ReadTimeout("Connection timed out")
 
     provider = GroqRefinerProvider(api_key="test-key")
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_timeout)
-    )
+    provider._client = mock_client_factory(_timeout)
 
     with pytest.raises(httpx.ReadTimeout):
         await provider.refine("test", "prompt", timeout=0.1)
 
 
-# ============================================================================
-# TUT-B026: Ollama sends correct format
-# ============================================================================
-
-
-@pytest.mark.asyncio
-async def test_ollama_sends_correct_format():
-    """TUT-B026: Ollama provider sends correctly formatted request."""
-    provider = OllamaRefinerProvider(model="llama3.2")
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_ollama_success_response)
-    )
-
-    result = await provider.refine("hello um world", "Fix the text.", timeout=5.0)
-
-    assert result.refined_text == "Hello world."
-    assert result.provider == "ollama"
-    assert result.tokens_used == 18
-
-
 # ============================================================================
 # TUT-B027: Ollama handles connection refused
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_ollama_handles_connection_refused():
+async def test_ollama_handles_connection_refused(mock_client_factory):
     """TUT-B027: Ollama provider raises on connection refused."""
 
     def _connection_refused(request: httpx.Request) -> httpx.Response:
         raise httpx.ConnectError("Connection refused")
 
     provider = OllamaRefinerProvider()
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_connection_refused)
-    )
+    provider._client = mock_client_factory(_connection_refused)
 
     with pytest.raises(httpx.ConnectError):
         await provider.refine("test", "prompt")
 
 
-# ============================================================================
-# TUT-B028: Gemini sends correct format
-# ============================================================================
-
-
-@pytest.mark.asyncio
-async def test_gemini_sends_correct_format():
-    """TUT-B028: Gemini provider sends correctly formatted request."""
-    provider = GeminiRefinerProvider(api_key="test-key-456")
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_gemini_success_response)
-    )
-
-    result = await provider.refine("hello um world", "Fix the text.", timeout=5.0)
-
-    assert result.refined_text == "Hello world."
-    assert result.provider == "gemini"
-    assert result.tokens_used == 30
-
-
-# ============================================================================
-# TUT-B029: Gemini handles auth error
-# ============================================================================
-
-
-@pytest.mark.asyncio
-async def test_gemini_handles_auth_error():
-    """TUT-B029: Gemini provider raises on 403 Forbidden."""
-
-    def _auth_error(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(403, json={"error": {"message": "API key invalid"}})
-
-    provider = GeminiRefinerProvider(api_key="bad-key")
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_auth_error)
-    )
-
-    with pytest.raises(httpx.HTTPStatusError) as exc_info:
-        await provider.refine("test", "prompt")
-    assert exc_info.value.response.status_code == 403
-
-
 # ============================================================================
 # TUT-B030: Provider factory returns correct type
 # ============================================================================
@@ -289,129 +281,54 @@ async def test_gemini_handles_auth_error():
 
 def test_provider_factory_returns_correct_type():
     """TUT-B030: PROVIDER_REGISTRY maps names to correct provider classes."""
-    assert PROVIDER_REGISTRY["anthropic"] is AnthropicRefinerProvider
-    assert PROVIDER_REGISTRY["openai"] is OpenAIRefinerProvider
-    assert PROVIDER_REGISTRY["groq"] is GroqRefinerProvider
-    assert PROVIDER_REGISTRY["ollama"] is OllamaRefinerProvider
-    assert PROVIDER_REGISTRY["gemini"] is GeminiRefinerProvider
-    assert len(PROVIDER_REGISTRY) == 6
+    assert len(PROVIDER_REGISTRY) == len(_EXPECTED_REGISTRY)
+    for name, cls in _EXPECTED_REGISTRY:
+        assert PROVIDER_REGISTRY[name] is cls
 
 
 # ============================================================================
-# TUT-B036: Anthropic sends correct API format
+# TUT-B040/B042: list_models returns models from the live API
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_anthropic_sends_correct_api_format():
-    """TUT-B036: Anthropic provider sends correctly formatted API request."""
-    provider = AnthropicRefinerProvider(api_key="test-key-789")
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_anthropic_success_response)
-    )
-
-    result = await provider.refine("hello um world", "Fix the text.", timeout=5.0)
-
-    assert result.refined_text == "Hello world."
-    assert result.provider == "anthropic"
-    assert result.tokens_used == 25  # 15 input + 10 output
-    assert result.processing_time_ms > 0
-
-
-# ============================================================================
-# TUT-B037: Anthropic handles auth error
-# ============================================================================
-
-
-@pytest.mark.asyncio
-async def test_anthropic_handles_auth_error():
-    """TUT-B037: Anthropic provider raises on 401 Unauthorized."""
-
-    def _auth_error(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(401, json={"error": {"message": "Invalid API Key"}})
-
-    provider = AnthropicRefinerProvider(api_key="bad-key")
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_auth_error)
-    )
-
-    with pytest.raises(httpx.HTTPStatusError) as exc_info:
-        await provider.refine("test", "prompt")
-    assert exc_info.value.response.status_code == 401
-
-
-# ============================================================================
-# TUT-B038: OpenAI sends correct API format
-# ============================================================================
-
-
-@pytest.mark.asyncio
-async def test_openai_sends_correct_api_format():
-    """TUT-B038: OpenAI provider sends correctly formatted API request."""
-    provider = OpenAIRefinerProvider(api_key="test-key-abc")
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_openai_success_response)
-    )
-
-    result = await provider.refine("hello um world", "Fix the text.", timeout=5.0)
-
-    assert result.refined_text == "Hello world."
-    assert result.provider == "openai"
-    assert result.tokens_used == 22
-    assert result.processing_time_ms > 0
-
-
-# ============================================================================
-# TUT-B039: OpenAI handles auth error
-# ============================================================================
-
+def _canned(body: dict):
+    """MockTransport handler that answers every request with *body* as JSON."""
+    content = json_dumps(body)
+    return lambda request: httpx.Response(200, content=content, headers=_JSON_HEADERS)
 
-@pytest.mark.asyncio
-async def test_openai_handles_auth_error():
-    """TUT-B039: OpenAI provider raises on 401 Unauthorized."""
 
-    def _auth_error(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(401, json={"error": {"message": "Invalid API Key"}})
-
-    provider = OpenAIRefinerProvider(api_key="bad-key")
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_auth_error)
-    )
-
-    with pytest.raises(httpx.HTTPStatusError) as exc_info:
-        await provider.refine("test", "prompt")
-    assert exc_info.value.response.status_code == 401
-
-
-# ============================================================================
-# TUT-B040: Groq list_models returns dynamic models
-# ============================================================================
-
-
-@pytest.mark.asyncio
-async def test_groq_list_models_dynamic():
-    """TUT-B040: Groq list_models queries API and returns models."""
-
-    def _models_response(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(
-            200,
-            json={
+@pytest.mark.parametrize(
+    "provider_cls,kwargs,body,expected_ids",
+    [
+        (
+            GroqRefinerProvider,
+            {"api_key": "test-key"},
+            {
                 "data": [
                     {"id": "llama-3.3-70b-versatile", "active": True},
                     {"id": "llama-3.1-8b-instant", "active": True},
                     {"id": "whisper-large-v3", "active": True},
                 ],
             },
-        )
-
-    provider = GroqRefinerProvider(api_key="test-key")
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_models_response)
-    )
+            ["llama-3.3-70b-versatile", "llama-3.1-8b-instant", "whisper-large-v3"],
+        ),
+        (
+            OllamaRefinerProvider,
+            {},
+            {"models": [{"name": "llama3.2:latest"}, {"name": "codellama:latest"}]},
+            ["llama3.2:latest", "codellama:latest"],
+        ),
+    ],
+    ids=["TUT-B040-groq", "TUT-B042-ollama"],
+)
+async def test_list_models_dynamic(provider_cls, kwargs, body, expected_ids, mock_client_factory):
+    """TUT-B040/B042: list_models queries the provider API and returns its models."""
+    provider = provider_cls(**kwargs)
+    provider._client = mock_client_factory(_canned(body))
 
     models = await provider.list_models()
-    assert len(models) == 3
-    assert models[0]["id"] == "llama-3.3-70b-versatile"
+
+    assert [m["id"] for m in models] == expected_ids
 
 
 # ============================================================================
@@ -419,69 +336,33 @@ async def test_groq_list_models_dynamic():
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_groq_list_models_fallback():
+async def test_groq_list_models_fallback(mock_client_factory):
     """TUT-B041: Groq list_models returns defaults when API fails."""
 
     def _error(request: httpx.Request) -> httpx.Response:
         return httpx.Response(500, json={"error": "Server error"})
 
     provider = GroqRefinerProvider(api_key="test-key")
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_error)
-    )
+    provider._client = mock_client_factory(_error)
 
     models = await provider.list_models()
     assert len(models) == 4  # Default list
     assert models[0]["id"] == "llama-3.3-70b-versatile"
 
 
-# ============================================================================
-# TUT-B042: Ollama list_models returns dynamic models
-# ============================================================================
-
-
-@pytest.mark.asyncio
-async def test_ollama_list_models_dynamic():
-    """TUT-B042: Ollama list_models queries /api/tags and returns models."""
-
-    def _tags_response(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(
-            200,
-            json={
-                "models": [
-                    {"name": "llama3.2:latest"},
-                    {"name": "codellama:latest"},
-                ],
-            },
-        )
-
-    provider = OllamaRefinerProvider()
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_tags_response)
-    )
-
-    models = await provider.list_models()
-    assert len(models) == 2
-    assert models[0]["id"] == "llama3.2:latest"
-
-
 # ============================================================================
 # TUT-B043: Ollama list_models falls back to defaults
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_ollama_list_models_fallback():
+async def test_ollama_list_models_fallback(mock_client_factory):
     """TUT-B043: Ollama list_models returns defaults when connection fails."""
 
     def _error(request: httpx.Request) -> httpx.Response:
         raise httpx.ConnectError("Connection refused")
 
     provider = OllamaRefinerProvider()
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_error)
-    )
+    provider._client = mock_client_factory(_error)
 
     models = await provider.list_models()
     assert len(models) == 1  # Default list
@@ -489,45 +370,32 @@ async def test_ollama_list_models_fallback():
 
 
 # ============================================================================
-# TUT-B044: Gemini list_models returns hardcoded list
-# ============================================================================
-
-
-@pytest.mark.asyncio
-async def test_gemini_list_models_hardcoded():
-    """TUT-B044: Gemini list_models returns hardcoded model list."""
-    provider = GeminiRefinerProvider(api_key="test-key")
-    models = await provider.list_models()
-    assert len(models) == 4
-    assert models[0]["id"] == "gemini-2.5-flash"
-
-
-# ============================================================================
-# TUT-B045: Anthropic list_models returns hardcoded list
+# TUT-B044/B045/B046: list_models returns the built-in model list
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_anthropic_list_models_hardcoded():
-    """TUT-B045: Anthropic list_models returns hardcoded model list."""
-    provider = AnthropicRefinerProvider(api_key="test-key")
-    models = await provider.list_models()
-    assert len(models) == 3
-    assert any(m["id"] == "claude-sonnet-4-5-20250929" for m in models)
+@pytest.mark.parametrize(
+    "provider_cls,expected_len,sentinel_id",
+    [
+        (GeminiRefinerProvider, 4, "gemini-2.5-flash"),
+        (AnthropicRefinerProvider, 3, "claude-sonnet-4-5-20250929"),
+    ],
+    ids=["TUT-B044-gemini", "TUT-B045-anthropic"],
+)
+async def test_list_models_hardcoded(provider_cls, expected_len, sentinel_id):
+    """TUT-B044/B045: list_models returns the provider's built-in model list."""
+    models = await provider_cls().list_models()
 
+    assert len(models) == expected_len
+    assert sentinel_id in {m["id"] for m in models}
 
-# ============================================================================
-# TUT-B046: OpenAI list_models returns hardcoded list
-# ============================================================================
 
+async def test_openai_list_models_defaults_without_key():
+    """TUT-B046: OpenAI list_models returns its defaults when no key is set."""
+    models = await OpenAIRefinerProvider().list_models()
 
-@pytest.mark.asyncio
-async def test_openai_list_models_hardcoded():
-    """TUT-B046: OpenAI list_models returns hardcoded model list."""
-    provider = OpenAIRefinerProvider(api_key="test-key")
-    models = await provider.list_models()
     assert len(models) == 3
-    assert any(m["id"] == "gpt-4o" for m in models)
+    assert "gpt-4o" in {m["id"] for m in models}
 
 
 # ============================================================================
@@ -554,44 +422,29 @@ def test_provider_display_names_and_api_key_requirements():
 
 
 # ============================================================================
-# TUT-B051: Anthropic list_models with custom models
-# ============================================================================
-
-
-@pytest.mark.asyncio
-async def test_anthropic_list_models_custom():
-    """TUT-B051: Anthropic list_models returns custom_models when provided."""
-    provider = AnthropicRefinerProvider(api_key="test-key")
-    custom = [{"id": "custom-claude", "name": "Custom Claude"}]
-    models = await provider.list_models(custom_models=custom)
-    assert models == custom
-
-
-# ============================================================================
-# TUT-B052: OpenAI list_models with custom models
+# TUT-B051/B052/B053: list_models returns custom models when provided
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_openai_list_models_custom():
-    """TUT-B052: OpenAI list_models returns custom_models when provided."""
-    provider = OpenAIRefinerProvider(api_key="test-key")
-    custom = [{"id": "custom-gpt", "name": "Custom GPT"}]
-    models = await provider.list_models(custom_models=custom)
+@pytest.mark.parametrize(
+    "provider_cls,custom_id",
+    [
+        (AnthropicRefinerProvider, "custom-claude"),
+        (GeminiRefinerProvider, "custom-gemini"),
+    ],
+    ids=["TUT-B051-anthropic", "TUT-B053-gemini"],
+)
+async def test_list_models_custom(provider_cls, custom_id):
+    """TUT-B051/B053: list_models returns custom_models when provided."""
+    custom = [{"id": custom_id, "name": custom_id}]
+    models = await provider_cls().list_models(custom_models=custom)
     assert models == custom
 
 
-# ============================================================================
-# TUT-B053: Gemini list_models with custom models
-# ============================================================================
-
-
-@pytest.mark.asyncio
-async def test_gemini_list_models_custom():
-    """TUT-B053: Gemini list_models returns custom_models when provided."""
-    provider = GeminiRefinerProvider(api_key="test-key")
-    custom = [{"id": "custom-gemini", "name": "Custom Gemini"}]
-    models = await provider.list_models(custom_models=custom)
+async def test_openai_list_models_custom_without_key():
+    """TUT-B052: OpenAI list_models returns custom_models when no key is set."""
+    custom = [{"id": "custom-gpt", "name": "custom-gpt"}]
+    models = await OpenAIRefinerProvider().list_models(custom_models=custom)
     assert models == custom
 
 
@@ -600,7 +453,6 @@ async def test_gemini_list_models_custom():
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_groq_list_models_custom_no_api_key():
     """TUT-B054: Groq returns custom_models instead of defaults when no API key."""
     provider = GroqRefinerProvider()  # no api_key
@@ -614,24 +466,11 @@ async def test_groq_list_models_custom_no_api_key():
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_groq_list_models_api_takes_precedence():
+async def test_groq_list_models_api_takes_precedence(mock_client_factory):
     """TUT-B055: Groq API response beats custom_models."""
 
-    def _models_response(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(
-            200,
-            json={
-                "data": [
-                    {"id": "live-model-1", "active": True},
-                ],
-            },
-        )
-
     provider = GroqRefinerProvider(api_key="test-key")
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_models_response)
-    )
+    provider._client = mock_client_factory(_canned({"data": [{"id": "live-model-1", "active": True}]}))
 
     custom = [{"id": "custom-llama", "name": "Custom Llama"}]
     models = await provider.list_models(custom_models=custom)
@@ -644,17 +483,14 @@ async def test_groq_list_models_api_takes_precedence():
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_ollama_list_models_custom_fallback():
+async def test_ollama_list_models_custom_fallback(mock_client_factory):
     """TUT-B056: Ollama returns custom_models when connection fails."""
 
     def _error(request: httpx.Request) -> httpx.Response:
         raise httpx.ConnectError("Connection refused")
 
     provider = OllamaRefinerProvider()
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_error)
-    )
+    provider._client = mock_client_factory(_error)
 
     custom = [{"id": "custom-ollama", "name": "Custom Ollama"}]
     models = await provider.list_models(custom_models=custom)
@@ -666,18 +502,11 @@ async def test_ollama_list_models_custom_fallback():
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_ollama_test_connection_success():
+async def test_ollama_test_connection_success(mock_client_factory):
     """TUT-B061: Ollama test_connection returns ok when reachable."""
     tags_response = {"models": [{"name": "llama3.2"}, {"name": "mistral"}]}
-
-    def _handler(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(200, json=tags_response)
-
     provider = OllamaRefinerProvider()
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_handler)
-    )
+    provider._client = mock_client_factory(_canned(tags_response))
 
     result = await provider.test_connection()
     assert result["ok"] is True
@@ -690,17 +519,14 @@ async def test_ollama_test_connection_success():
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_ollama_test_connection_fail():
+async def test_ollama_test_connection_fail(mock_client_factory):
     """TUT-B062: Ollama test_connection returns fail when unreachable."""
 
     def _error(request: httpx.Request) -> httpx.Response:
         raise httpx.ConnectError("Connection refused")
 
     provider = OllamaRefinerProvider()
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_error)
-    )
+    provider._client = mock_client_factory(_error)
 
     result = await provider.test_connection()
     assert result["ok"] is False
@@ -712,18 +538,11 @@ async def test_ollama_test_connection_fail():
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_groq_test_connection_success():
+async def test_groq_test_connection_success(mock_client_factory):
     """TUT-B063: Groq test_connection returns ok with valid API key."""
     models_response = {"data": [{"id": "llama-3.3-70b-versatile"}]}
-
-    def _handler(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(200, json=models_response)
-
     provider = GroqRefinerProvider(api_key="gsk_test")
-    provider._client = httpx.AsyncClient(
-        transport=httpx.MockTransport(_handler)
-    )
+    provider._client = mock_client_factory(_canned(models_response))
 
     result = await provider.test_connection()
     assert result["ok"] is True
@@ -731,56 +550,175 @@ async def test_groq_test_connection_success():
 
 
 # ============================================================================
-# TUT-B064: Groq test_connection returns fail without key
+# TUT-B064/B065/B066/B067: test_connection returns fail without key
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_groq_test_connection_no_key():
-    """TUT-B064: Groq test_connection returns fail without API key."""
-    provider = GroqRefinerProvider()
-    result = await provider.test_connection()
+# Walks the live registry so a newly added key-based provider is covered too
+_KEYED_PROVIDERS = {
+    name: cls for name, cls in PROVIDER_REGISTRY.items() if cls.REQUIRES_API_KEY
+}
+
+
+@pytest.mark.parametrize("provider_cls", list(_KEYED_PROVIDERS.values()), ids=list(_KEYED_PROVIDERS))
+async def test_test_connection_no_key(provider_cls):
+    """TUT-B064/B065/B066/B067: Every key-based provider fails test_connection without a key."""
+    result = await provider_cls().test_connection()
     assert result["ok"] is False
     assert "not configured" in result["message"]
 
 
 # ============================================================================
-# TUT-B065: Anthropic test_connection returns fail without key
+# TUT-B069: Gemini reuses a context cache for long system prompts
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_anthropic_test_connection_no_key():
-    """TUT-B065: Anthropic test_connection returns fail without API key."""
-    provider = AnthropicRefinerProvider()
-    result = await provider.test_connection()
-    assert result["ok"] is False
-    assert "not configured" in result["message"]
+async def test_gemini_long_prompt_uses_context_cache(mock_client_factory):
+    """TUT-B069: Long system prompts are cached once and referenced by name."""
+    requests = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith("/cachedContents"):
+            return httpx.Response(200, json={"name": "cachedContents/abc123"})
+        return _gemini_success_response(request)
+
+    provider = GeminiRefinerProvider(api_key="test-key")
+    provider._client = mock_client_factory(_handler)
+
+    long_prompt = "Fix the text. " * 400
+    await provider.refine("first", long_prompt)
+    await provider.refine("second", long_prompt)
+
+    cache_calls = [r for r in requests if r.url.path.endswith("/cachedContents")]
+    assert len(cache_calls) == 1
+    body = json.loads(requests[-1].content)
+    assert body["cachedContent"] == "cachedContents/abc123"
+    assert "system_instruction" not in body
+    # Cache creation gets half the refine timeout (default 5s) and counts against it
+    assert requests[0].extensions["timeout"]["read"] == 2.5
+    assert 2.5 <= requests[1].extensions["timeout"]["read"] < 5.0
 
 
 # ============================================================================
-# TUT-B066: OpenAI test_connection returns fail without key
+# TUT-B072: OpenAI/Anthropic send prompt caching hints
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_openai_test_connection_no_key():
-    """TUT-B066: OpenAI test_connection returns fail without API key."""
-    provider = OpenAIRefinerProvider()
-    result = await provider.test_connection()
-    assert result["ok"] is False
-    assert "not configured" in result["message"]
+async def test_prompt_caching_hints(mock_client_factory):
+    """TUT-B072: System prompt is keyed (OpenAI) or marked cacheable (Anthropic)."""
+    bodies = []
+
+    def _capture(handler):
+        def _inner(request: httpx.Request) -> httpx.Response:
+            bodies.append(json.loads(request.content))
+            return handler(request)
+        return _inner
+
+    openai = OpenAIRefinerProvider(api_key="test-key")
+    openai._client = mock_client_factory(_capture(_openai_success_response))
+    await openai.refine("one", "Fix the text.")
+    await openai.refine("two", "Fix the text.")
+    await openai.refine("three", "Other prompt.")
+    keys = [b["prompt_cache_key"] for b in bodies]
+    assert keys[0] == keys[1] != keys[2]
+    assert bodies[0]["messages"][0] == {"role": "system", "content": "Fix the text."}
+
+    anthropic = AnthropicRefinerProvider(api_key="test-key")
+    anthropic._client = mock_client_factory(_capture(_anthropic_success_response))
+    await anthropic.refine("hello", "Fix the text.")
+    system = bodies[-1]["system"]
+    assert system[0]["text"] == "Fix the text."
+    assert system[0]["cache_control"] == {"type": "ephemeral"}
 
 
 # ============================================================================
-# TUT-B067: Gemini test_connection returns fail without key
+# TUT-B074: OpenAI list_models filters and sorts by version
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_gemini_test_connection_no_key():
-    """TUT-B067: Gemini test_connection returns fail without API key."""
-    provider = GeminiRefinerProvider()
-    result = await provider.test_connection()
-    assert result["ok"] is False
-    assert "not configured" in result["message"]
+async def test_openai_list_models_version_sort(mock_client_factory):
+    """TUT-B074: Non-chat models are dropped and version numbers sort numerically (5.10 above 5.2)."""
+
+    def _models(request: httpx.Request) -> httpx.Response:
+        ids = ["gpt-4o", "gpt-5.10", "gpt-4o-audio-preview", "text-embedding-3-small", "gpt-5.2", "o1"]
+        return httpx.Response(200, json={"data": [{"id": i} for i in ids]})
+
+    provider = OpenAIRefinerProvider(api_key="test-key")
+    provider._client = mock_client_factory(_models)
+
+    models = await provider.list_models()
+
+    assert [m["id"] for m in models] == ["o1", "gpt-5.10", "gpt-5.2", "gpt-4o"]
+
+
+# ============================================================================
+# TUT-B088: Mid-stream errors and truncated streams fall back to raw text
+# ============================================================================
+
+
+@pytest.mark.parametrize(
+    "name,provider_cls,kwargs,body",
+    [
+        (
+            "ollama",
+            OllamaRefinerProvider,
+            {},
+            json_dumps({"message": {"content": "Hel"}, "done": False}) + b"\n"
+            + json_dumps({"error": "model runner has unexpectedly stopped"}) + b"\n",
+        ),
+        (
+            "ollama",
+            OllamaRefinerProvider,
+            {},
+            json_dumps({"message": {"content": "Hel"}, "done": False}) + b"\n",
+        ),
+        (
+            "openai",
+            OpenAIRefinerProvider,
+            {"api_key": "test-key"},
+            b"data: " + json_dumps({"choices": [{"delta": {"content": "Hel"}}]}) + b"\n\n"
+            + b"data: " + json_dumps({"error": {"message": "server_error"}}) + b"\n\n",
+        ),
+        (
+            "openai",
+            OpenAIRefinerProvider,
+            {"api_key": "test-key"},
+            b"data: " + json_dumps({"choices": [{"delta": {"content": "Hel"}}]}) + b"\n\n",
+        ),
+    ],
+    ids=["ollama-error", "ollama-truncated", "openai-error", "openai-truncated"],
+)
+async def test_broken_stream_falls_back_to_raw_text(
+    name, provider_cls, kwargs, body, mock_client_factory
+):
+    """TUT-B088: A 200 stream that errors or ends early is a failure, not a short result."""
+    provider = provider_cls(**kwargs)
+    provider._client = mock_client_factory(lambda request: httpx.Response(200, content=body))
+    refiner = Refiner()
+    refiner._enabled = True
+    refiner._active_provider = name
+    refiner._providers[name] = provider
+
+    result = await refiner.process("hello um world")
+
+    assert result.refined_text == "hello um world"
+    assert result.model == "fallback"
+
+
+# ============================================================================
+# TUT-B089: Ollama derives its tags URL without losing a path prefix
+# ============================================================================
+
+
+@pytest.mark.parametrize(
+    "base_url,tags_url",
+    [
+        ("http://localhost:11434/api/chat", "http://localhost:11434/api/tags"),
+        ("http://host/ollama/api/chat", "http://host/ollama/api/tags"),
+        ("http://host/ollama/", "http://host/ollama/api/tags"),
+    ],
+)
+def test_ollama_tags_url_keeps_path_prefix(base_url, tags_url):
+    """TUT-B089: Reverse-proxied base URLs keep their prefix for /api/tags."""
+    assert OllamaRefinerProvider(base_url=base_url)._tags_url == tags_url
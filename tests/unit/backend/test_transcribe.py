@@ -3,11 +3,9 @@ Tests for POST /transcribe endpoint.
 """
 
 import io
+import json
 
-import pytest
 
-
-@pytest.mark.asyncio
 async def test_transcribe_with_wav(test_client, test_wav_bytes):
     """POST /transcribe with a WAV file should return transcription result."""
     files = {"file": ("test.wav", io.BytesIO(test_wav_bytes), "audio/wav")}
@@ -25,7 +23,6 @@ async def test_transcribe_with_wav(test_client, test_wav_bytes):
     assert "processing_time" in data
 
 
-@pytest.mark.asyncio
 async def test_transcribe_returns_text(test_client, test_wav_bytes):
     """Transcription result should contain non-empty text from mock."""
     files = {"file": ("test.wav", io.BytesIO(test_wav_bytes), "audio/wav")}
@@ -37,7 +34,6 @@ async def test_transcribe_returns_text(test_client, test_wav_bytes):
     assert data["language"] == "en"
 
 
-@pytest.mark.asyncio
 async def test_transcribe_empty_file_returns_400(test_client):
     """POST /transcribe with an empty file should return 400."""
     files = {"file": ("empty.wav", io.BytesIO(b""), "audio/wav")}
@@ -46,3 +42,20 @@ async def test_transcribe_empty_file_returns_400(test_client):
     assert response.status_code == 400
     data = response.json()
     assert "error" in data
+
+
+async def test_transcribe_stream_yields_segments(test_client, test_wav_bytes):
+    """POST /transcribe/stream should send each segment, then a done event."""
+    files = {"file": ("test.wav", io.BytesIO(test_wav_bytes), "audio/wav")}
+    response = await test_client.post("/transcribe/stream", files=files)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [
+        json.loads(line[len("data: "):])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    assert events[0]["segment"]["text"] == "Hello world"
+    assert events[-1]["done"] is True
+    assert events[-1]["text"] == "Hello world"
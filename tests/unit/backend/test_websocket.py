@@ -6,28 +6,20 @@ does not support ASGITransport-based WebSocket connections.
 """
 
 import json
-import sys
-from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
 from starlette.testclient import TestClient
 
-backend_src = Path(__file__).resolve().parents[3] / "src" / "backend"
-if str(backend_src) not in sys.path:
-    sys.path.insert(0, str(backend_src))
+import app.stt.whisper_engine as engine_mod
+from app.main import app as asgi_app
 
 
 @pytest.fixture()
 def ws_test_client(mock_whisper_model, monkeypatch):
     """Create a Starlette TestClient (sync) for WebSocket testing."""
-    import app.stt.whisper_engine as engine_mod
-
-    engine_mod._engine_instance = None
-
-    from app.main import app
-
-    return TestClient(app)
+    engine_mod.get_engine(force_new=True, preload=False)
+    return TestClient(asgi_app)
 
 
 def test_websocket_connect_and_receive_ready(ws_test_client):
@@ -0,0 +1,254 @@
+"""
+Unit tests for the BACON-AI Voice Backend Whisper engine.
+
+Test IDs:
+    TUT-B080: transcribe_audio normalizes loud input without touching the caller's buffer
+    TUT-B081: The target model is pre-warmed in a background thread
+    TUT-B082: Switching back to a cached model reuses it; one slot by default
+    TUT-B083: Omitted language uses the engine default; None auto-detects
+    TUT-B084: CPU engines decode greedily unless beam_size is set
+    TUT-B085: VAD is skipped for clips under vad_threshold_seconds
+    TUT-B086: Cached model weights load with local_files_only
+"""
+
+
+import sys
+
+import numpy as np
+import pytest
+
+import app.stt.whisper_engine as engine_mod
+from app.stt.whisper_engine import WhisperEngine
+
+
+def _capture_calls(engine):
+    """Load the mock model and record (audio_input, kwargs) for each transcribe()."""
+    assert engine.load_model()
+    calls = []
+    original = engine._model.transcribe
+
+    def transcribe(audio_input, **kwargs):
+        calls.append((audio_input, kwargs))
+        return original(audio_input, **kwargs)
+
+    engine._model.transcribe = transcribe
+    return calls
+
+
+# ============================================================================
+# TUT-B080: transcribe_audio normalizes loud input without touching the caller's buffer
+# ============================================================================
+
+
+def test_transcribe_audio_normalizes_float32_without_mutating(engine_with_mock):
+    """TUT-B080: Float32 input above full scale is scaled on a copy."""
+    calls = _capture_calls(engine_with_mock)
+    audio = np.array([0.5, -4.0, 2.0], dtype=np.float32)
+
+    result = engine_with_mock.transcribe_audio(audio)
+
+    assert result.text == "Hello world"
+    assert calls[0][0].dtype == np.float32
+    np.testing.assert_allclose(calls[0][0], [0.125, -1.0, 0.5])
+    np.testing.assert_array_equal(audio, [0.5, -4.0, 2.0])
+
+
+def test_transcribe_audio_converts_int16(engine_with_mock):
+    """TUT-B080: Integer PCM is converted to float32 and peak-normalized."""
+    calls = _capture_calls(engine_with_mock)
+    audio = np.array([0, 16384, -32768], dtype=np.int16)
+
+    engine_with_mock.transcribe_audio(audio)
+
+    assert calls[0][0].dtype == np.float32
+    np.testing.assert_allclose(calls[0][0], [0.0, 0.5, -1.0])
+
+
+def test_transcribe_audio_passes_float32_through(engine_with_mock):
+    """TUT-B080: Contiguous float32 within full scale reaches the model uncopied."""
+    calls = _capture_calls(engine_with_mock)
+    audio = np.array([0.25, -0.5, 0.75], dtype=np.float32)
+    strided = np.array([0.5, 0.0, -2.0, 0.0], dtype=np.float32)[::2]
+
+    engine_with_mock.transcribe_audio(audio)
+    engine_with_mock.transcribe_audio(strided)
+
+    assert calls[0][0] is audio
+    assert calls[1][0].flags.c_contiguous
+    np.testing.assert_allclose(calls[1][0], [0.25, -1.0])
+
+
+# ============================================================================
+# TUT-B081: The target model is pre-warmed in a background thread
+# ============================================================================
+
+
+def test_engine_preloads_model(mock_whisper_model):
+    """TUT-B081: A new engine loads its model without waiting for a request."""
+    engine = WhisperEngine(model_name="base")
+    engine._preload_thread.join(timeout=5)
+
+    assert engine.is_ready()
+    assert engine.current_model == "base"
+    assert engine.get_status()["loading"] is False
+
+
+def test_engine_preload_disabled(mock_whisper_model):
+    """TUT-B081: preload=False keeps loading lazy."""
+    engine = WhisperEngine(model_name="base", preload=False)
+
+    assert engine._preload_thread is None
+    assert not engine.is_ready()
+
+
+# ============================================================================
+# TUT-B082: Switching back to a cached model reuses it; one slot by default
+# ============================================================================
+
+
+def test_switch_model_reuses_cached_model(mock_whisper_model, monkeypatch):
+    """TUT-B082: With two cache slots, base -> small -> base hands back the first base."""
+    monkeypatch.setattr("app.stt.whisper_engine._MODEL_CACHE_MAX", 2)
+    engine = WhisperEngine(model_name="base", preload=False)
+    assert engine.load_model()
+    first = engine._model
+
+    assert engine.switch_model("small")
+    assert engine._model is not first
+    assert engine.switch_model("base")
+
+    assert engine._model is first
+
+
+def test_switch_model_single_slot_frees_previous(mock_whisper_model, monkeypatch):
+    """TUT-B082: With the default single slot, the old model is dropped before the new loads."""
+    resident_at_load = []
+
+    def _whisper_model(*args, **kwargs):
+        resident_at_load.append([key[0] for key in engine_mod._MODEL_CACHE])
+        return mock_whisper_model(*args, **kwargs)
+
+    monkeypatch.setattr(sys.modules["faster_whisper"], "WhisperModel", _whisper_model)
+    engine = WhisperEngine(model_name="base", preload=False)
+    assert engine.load_model()
+    first = engine._model
+
+    assert engine.switch_model("small")
+    assert engine.switch_model("base")
+
+    assert resident_at_load == [[], [], []]
+    assert engine._model is not first
+
+
+def test_unload_model_evicts_from_cache(mock_whisper_model):
+    """TUT-B082: unload_model() drops the model from the shared cache."""
+    engine = WhisperEngine(model_name="base", preload=False)
+    assert engine.load_model()
+    first = engine._model
+
+    engine.unload_model()
+    assert engine.load_model()
+
+    assert engine._model is not first
+
+
+def test_model_cache_size_ignores_invalid_env(monkeypatch):
+    """TUT-B082: A non-integer BACON_VOICE_MODEL_CACHE falls back to one slot."""
+    monkeypatch.setenv("BACON_VOICE_MODEL_CACHE", "two")
+    assert engine_mod._model_cache_size() == 1
+
+    monkeypatch.setenv("BACON_VOICE_MODEL_CACHE", "3")
+    assert engine_mod._model_cache_size() == 3
+
+
+# ============================================================================
+# TUT-B083: Omitted language uses the engine default; None auto-detects
+# ============================================================================
+
+
+def test_language_defaults_and_timestamps(mock_whisper_model):
+    """TUT-B083: language falls back to default_language unless None is passed."""
+    engine = WhisperEngine(model_name="base", preload=False, default_language="de")
+    calls = _capture_calls(engine)
+    audio = np.zeros(1600, dtype=np.float32)
+
+    engine.transcribe_audio(audio)
+    engine.transcribe_audio(audio, language=None, need_timestamps=False)
+
+    assert calls[0][1]["language"] == "de"
+    assert calls[0][1]["without_timestamps"] is False
+    assert calls[1][1]["language"] is None
+    assert calls[1][1]["without_timestamps"] is True
+
+
+# ============================================================================
+# TUT-B084: CPU engines decode greedily unless beam_size is set
+# ============================================================================
+
+
+def test_cpu_engine_defaults_to_greedy(mock_whisper_model):
+    """TUT-B084: beam_size=1, best_of=1 and one temperature on CPU."""
+    engine = WhisperEngine(model_name="base", preload=False)
+    calls = _capture_calls(engine)
+
+    engine.transcribe_audio(np.zeros(1600, dtype=np.float32))
+
+    options = calls[0][1]
+    assert engine.get_status()["beam_size"] == 1
+    assert options["beam_size"] == 1
+    assert options["best_of"] == 1
+    assert options["temperature"] == (0.0,)
+    assert options["condition_on_previous_text"] is False
+
+
+def test_beam_size_override(mock_whisper_model):
+    """TUT-B084: An explicit beam_size keeps the temperature fallback."""
+    engine = WhisperEngine(model_name="base", preload=False, beam_size=5)
+    calls = _capture_calls(engine)
+
+    engine.transcribe_audio(np.zeros(1600, dtype=np.float32))
+
+    options = calls[0][1]
+    assert options["beam_size"] == 5
+    assert "temperature" not in options
+
+
+# ============================================================================
+# TUT-B085: VAD is skipped for clips under vad_threshold_seconds
+# ============================================================================
+
+
+def test_short_audio_skips_vad(engine_with_mock):
+    """TUT-B085: 0.5s runs without VAD; 2s keeps it."""
+    calls = _capture_calls(engine_with_mock)
+
+    engine_with_mock.transcribe_audio(np.zeros(8000, dtype=np.float32))
+    engine_with_mock.transcribe_audio(np.zeros(32000, dtype=np.float32))
+
+    assert calls[0][1]["vad_filter"] is False
+    assert calls[1][1]["vad_filter"] is True
+
+
+# ============================================================================
+# TUT-B086: Cached model weights load with local_files_only
+# ============================================================================
+
+
+def test_local_files_only_when_model_cached(mock_whisper_model, tmp_path, monkeypatch):
+    """TUT-B086: A model.bin under the hub cache dir skips the hub check."""
+    monkeypatch.delenv("BACON_VOICE_OFFLINE", raising=False)
+    engine = WhisperEngine(model_name="base", download_root=tmp_path, preload=False)
+    assert engine._use_local_files_only() is False
+
+    snapshot = tmp_path / "models--Systran--faster-whisper-base" / "snapshots" / "abc"
+    snapshot.mkdir(parents=True)
+    (snapshot / "model.bin").write_bytes(b"")
+    assert engine._use_local_files_only() is True
+
+
+def test_offline_env_forces_local_files_only(mock_whisper_model, tmp_path, monkeypatch):
+    """TUT-B086: BACON_VOICE_OFFLINE forces local_files_only."""
+    monkeypatch.setenv("BACON_VOICE_OFFLINE", "1")
+    engine = WhisperEngine(model_name="base", download_root=tmp_path, preload=False)
+
+    assert engine._use_local_files_only() is True
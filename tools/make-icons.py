@@ -30,7 +30,7 @@ def make_icon(path: Path, active: bool):
     draw.line([12, 28, 20, 28], fill=mic_color, width=2)
 
     path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(str(path), format="PNG")
+    img.save(str(path), format="PNG", compress_level=1)
     print(f"Created: {path}")
 
 if not HAS_PIL: